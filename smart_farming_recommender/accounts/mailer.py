@@ -0,0 +1,26 @@
+import logging
+
+from django.conf import settings
+from django.core import mail
+
+logger = logging.getLogger(__name__)
+
+
+def submit_otp(email, subject, body):
+    """
+    Queues an OTP email for delivery and returns immediately.
+
+    EMAIL_BACKEND is djcelery_email's CeleryEmailBackend, so send() only
+    publishes a task; a Celery worker on the email queue delivers it over
+    SMTP, reusing its connection for each chunk of messages.
+
+    Returns False if the message could not be queued (e.g. the broker is
+    down), so callers don't tell the user an OTP is on its way.
+    """
+    message = mail.EmailMessage(subject, body, settings.EMAIL_HOST_USER, [email])
+    try:
+        message.send()
+    except Exception as e:
+        logger.error("Failed to queue OTP email: %s", e)
+        return False
+    return True
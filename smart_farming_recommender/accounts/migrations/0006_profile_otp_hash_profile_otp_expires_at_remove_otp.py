@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_profile_otp_verified_for_password_reset'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='profile',
+            name='otp',
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='otp_hash',
+            field=models.BinaryField(blank=True, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='otp_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
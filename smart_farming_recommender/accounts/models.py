@@ -1,6 +1,15 @@
+import hashlib
+import hmac
+from datetime import timedelta
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+OTP_VALIDITY = timedelta(minutes=5)
+
+def hash_otp(otp):
+    return hashlib.sha256(otp.encode()).digest()
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -44,9 +53,23 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
 class Profile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    otp = models.CharField(max_length=6, blank=True, null=True)
+    otp_hash = models.BinaryField(max_length=32, blank=True, null=True)
+    otp_expires_at = models.DateTimeField(blank=True, null=True)
     is_verified = models.BooleanField(default=False)
     otp_verified_for_password_reset = models.BooleanField(default=False)
 
     def __str__(self):
-        return self.user.email
\ No newline at end of file
+        return self.user.email
+
+    def set_otp(self, otp):
+        # Only the digest is stored; the plaintext OTP goes out by email.
+        self.otp_hash = hash_otp(otp)
+        self.otp_expires_at = timezone.now() + OTP_VALIDITY
+        self.save(update_fields=['otp_hash', 'otp_expires_at'])
+
+    def check_otp(self, otp):
+        if self.otp_hash is None or self.otp_expires_at is None:
+            return False
+        if self.otp_expires_at <= timezone.now():
+            return False
+        return hmac.compare_digest(bytes(self.otp_hash), hash_otp(otp))
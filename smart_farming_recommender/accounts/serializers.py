@@ -1,8 +1,9 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import CustomUser, Profile
-from django.core.mail import send_mail
-from django.conf import settings
-import random
+from .models import CustomUser, Profile, OTP_VALIDITY, hash_otp
+from .mailer import submit_otp
+from .utils import generate_otp
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
@@ -18,30 +19,27 @@ class UserSerializer(serializers.ModelSerializer):
         return attrs
 
     def create(self, validated_data):
-        user = CustomUser.objects.create_user(
-            email=validated_data['email'],
-            first_name=validated_data['first_name'],
-            last_name=validated_data['last_name'],
-            place=validated_data['place'],
-            pincode=validated_data['pincode'],
-            phone_number=validated_data['phone_number'],
-            password=validated_data['password']
-        )
-        profile = Profile.objects.create(user=user)
-        
-        # Generate and send OTP
-        otp = str(random.randint(100000, 999999))
-        profile.otp = otp
-        profile.save()
+        otp = generate_otp()
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(
+                email=validated_data['email'],
+                first_name=validated_data['first_name'],
+                last_name=validated_data['last_name'],
+                place=validated_data['place'],
+                pincode=validated_data['pincode'],
+                phone_number=validated_data['phone_number'],
+                password=validated_data['password']
+            )
+            # Create the profile with its OTP already set, saving a separate UPDATE
+            Profile.objects.create(
+                user=user,
+                otp_hash=hash_otp(otp),
+                otp_expires_at=timezone.now() + OTP_VALIDITY,
+            )
 
-        # Send OTP to user's email
-        send_mail(
-            'OTP for Registration',
-            f'Your OTP is: {otp}',
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            fail_silently=False,
-        )
+        # Send OTP to user's email once the user is committed; RegisterView
+        # checks otp_sent before reporting success
+        self.otp_sent = submit_otp(user.email, 'OTP for Registration', f'Your OTP is: {otp}')
         return user
 
 class VerifyOTPSerializer(serializers.Serializer):
@@ -1,3 +1,121 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from .models import CustomUser, Profile
+from .throttles import OTPEmailRateThrottle, OTPIPRateThrottle
 
-# Create your tests here.
+# Cooldowns and throttles live in the cache; keep the tests off Redis
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+def create_profile(email='farmer@example.com'):
+    user = CustomUser.objects.create_user(email=email, password='secret')
+    return Profile.objects.create(user=user)
+
+class ProfileOTPTests(TestCase):
+    def setUp(self):
+        self.profile = create_profile()
+
+    def test_accepts_correct_otp(self):
+        self.profile.set_otp('123456')
+        self.assertTrue(self.profile.check_otp('123456'))
+
+    def test_stores_only_the_digest(self):
+        self.profile.set_otp('123456')
+        self.profile.refresh_from_db()
+        self.assertNotIn(b'123456', bytes(self.profile.otp_hash))
+        self.assertTrue(self.profile.check_otp('123456'))
+
+    def test_rejects_wrong_otp(self):
+        self.profile.set_otp('123456')
+        self.assertFalse(self.profile.check_otp('654321'))
+
+    def test_rejects_expired_otp(self):
+        self.profile.set_otp('123456')
+        self.profile.otp_expires_at = timezone.now() - timedelta(seconds=1)
+        self.assertFalse(self.profile.check_otp('123456'))
+
+    def test_rejects_when_no_otp_was_set(self):
+        self.assertFalse(self.profile.check_otp('123456'))
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch('accounts.views.submit_otp', return_value=True)
+class OTPCooldownTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.profile = create_profile()
+
+    def test_second_resend_within_cooldown_is_rejected(self, submit_otp):
+        url = reverse('resend_otp')
+        first = self.client.post(url, {'email': 'farmer@example.com'}, content_type='application/json')
+        second = self.client.post(url, {'email': 'farmer@example.com'}, content_type='application/json')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 429)
+        submit_otp.assert_called_once()
+
+    def test_cooldown_is_per_purpose(self, submit_otp):
+        self.client.post(reverse('resend_otp'), {'email': 'farmer@example.com'}, content_type='application/json')
+        response = self.client.post(reverse('forgot_password'), {'email': 'farmer@example.com'}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_email_does_not_start_cooldown(self, submit_otp):
+        url = reverse('resend_otp')
+        missing = self.client.post(url, {'email': 'nobody@example.com'}, content_type='application/json')
+        create_profile('nobody@example.com')
+        response = self.client.post(url, {'email': 'nobody@example.com'}, content_type='application/json')
+
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(response.status_code, 200)
+
+    def test_failed_send_returns_503_and_allows_retry(self, submit_otp):
+        url = reverse('resend_otp')
+        submit_otp.return_value = False
+        failed = self.client.post(url, {'email': 'farmer@example.com'}, content_type='application/json')
+        submit_otp.return_value = True
+        retried = self.client.post(url, {'email': 'farmer@example.com'}, content_type='application/json')
+
+        self.assertEqual(failed.status_code, 503)
+        self.assertEqual(retried.status_code, 200)
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class OTPThrottleKeyTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def _request(self, data, **extra):
+        return Request(self.factory.post('/', data, format='json', **extra), parsers=[JSONParser()])
+
+    def test_ip_key_uses_remote_addr_not_forwarded_for(self):
+        throttle = OTPIPRateThrottle()
+        first = throttle.get_cache_key(self._request({}, REMOTE_ADDR='203.0.113.5', HTTP_X_FORWARDED_FOR='198.51.100.1'), None)
+        second = throttle.get_cache_key(self._request({}, REMOTE_ADDR='203.0.113.5', HTTP_X_FORWARDED_FOR='198.51.100.2'), None)
+
+        self.assertEqual(first, second)
+        self.assertIn('203.0.113.5', first)
+
+    def test_ip_key_differs_per_client(self):
+        throttle = OTPIPRateThrottle()
+        first = throttle.get_cache_key(self._request({}, REMOTE_ADDR='203.0.113.5'), None)
+        second = throttle.get_cache_key(self._request({}, REMOTE_ADDR='203.0.113.6'), None)
+
+        self.assertNotEqual(first, second)
+
+    def test_email_key_is_case_insensitive(self):
+        throttle = OTPEmailRateThrottle()
+        first = throttle.get_cache_key(self._request({'email': 'Farmer@Example.com '}), None)
+        second = throttle.get_cache_key(self._request({'email': 'farmer@example.com'}), None)
+
+        self.assertEqual(first, second)
+
+    def test_email_key_skips_requests_without_an_email(self):
+        throttle = OTPEmailRateThrottle()
+
+        self.assertIsNone(throttle.get_cache_key(self._request({}), None))
+        self.assertIsNone(throttle.get_cache_key(self._request([{'email': 'farmer@example.com'}]), None))
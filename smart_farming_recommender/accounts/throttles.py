@@ -0,0 +1,23 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+class OTPIPRateThrottle(SimpleRateThrottle):
+    """
+    Limits OTP-sending endpoints per client IP, authenticated or not.
+    """
+    scope = 'otp_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+class OTPEmailRateThrottle(SimpleRateThrottle):
+    """
+    Limits OTP-sending endpoints per target email address.
+    """
+    scope = 'otp_email'
+
+    def get_cache_key(self, request, view):
+        # request.data is a list for a JSON array body
+        email = request.data.get('email') if isinstance(request.data, dict) else None
+        if not email:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': str(email).strip().lower()}
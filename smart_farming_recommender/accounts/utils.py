@@ -0,0 +1,53 @@
+import secrets
+from django.core.cache import cache
+from .models import Profile
+
+VERIFIED_CACHE_TIMEOUT = 60 * 60
+# Matches the resend timer on the OTP pages
+OTP_COOLDOWN_SECONDS = 30
+
+def _verified_cache_key(user_id):
+    return f'verified:{user_id}'
+
+def is_verified(user_id):
+    """
+    Returns the user's OTP verification flag, reading through the cache.
+    """
+    key = _verified_cache_key(user_id)
+    verified = cache.get(key)
+    if verified is None:
+        verified = Profile.objects.only('is_verified').get(user_id=user_id).is_verified
+        cache.set(key, verified, VERIFIED_CACHE_TIMEOUT)
+    return verified
+
+def mark_verified(user_id):
+    cache.set(_verified_cache_key(user_id), True, VERIFIED_CACHE_TIMEOUT)
+
+def generate_otp():
+    """
+    Returns a cryptographically random six-digit OTP.
+    """
+    return f"{secrets.randbelow(900000) + 100000:06d}"
+
+# Purposes an OTP is sent for; each has its own resend window
+OTP_PURPOSE_VERIFICATION = 'verification'
+OTP_PURPOSE_PASSWORD_RESET = 'password_reset'
+
+def _otp_cooldown_key(email, purpose):
+    return f'otp:cooldown:{purpose}:{email.lower()}'
+
+def start_otp_cooldown(email, purpose):
+    """
+    Starts the resend window for an email address and OTP purpose.
+
+    Returns False if an OTP for the same purpose was already sent to it within
+    the window, in which case no new OTP should be generated or mailed.
+    cache.add is atomic on Redis.
+    """
+    return cache.add(_otp_cooldown_key(email, purpose), 1, OTP_COOLDOWN_SECONDS)
+
+def end_otp_cooldown(email, purpose):
+    """
+    Ends the resend window early, e.g. when the OTP could not be sent.
+    """
+    cache.delete(_otp_cooldown_key(email, purpose))
@@ -12,38 +12,57 @@ from .models import CustomUser, Profile
 from django.utils import timezone
 from datetime import timedelta
 import uuid
-from django.core.mail import send_mail
-from django.conf import settings
-import random
+from .mailer import submit_otp
+from .utils import (
+    OTP_PURPOSE_PASSWORD_RESET, OTP_PURPOSE_VERIFICATION,
+    end_otp_cooldown, generate_otp, is_verified, mark_verified, start_otp_cooldown
+)
+from .throttles import OTPIPRateThrottle, OTPEmailRateThrottle
+
+OTP_NOT_SENT_ERROR = 'We could not send the OTP right now. Please try again in a moment.'
+
+def _otp_not_sent_response(email, purpose):
+    # Let the user retry straight away rather than wait out the cooldown
+    end_otp_cooldown(email, purpose)
+    return Response({'error': OTP_NOT_SENT_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
 class ResendOTPView(APIView):
+    throttle_classes = [OTPIPRateThrottle, OTPEmailRateThrottle]
+
     def post(self, request):
         serializer = ResendOTPSerializer(data=request.data)
         if serializer.is_valid():
             email = serializer.validated_data['email']
             try:
-                user = CustomUser.objects.get(email=email)
-                profile = user.profile
-                
-                otp = str(random.randint(100000, 999999))
-                profile.otp = otp
-                profile.save()
-                
-                send_mail(
-                    'Your new OTP',
-                    f'Your new OTP is: {otp}',
-                    settings.EMAIL_HOST_USER,
-                    [email],
-                    fail_silently=False,
-                )
-                return Response({'message': 'A new OTP has been sent to your email.'}, status=status.HTTP_200_OK)
-            except CustomUser.DoesNotExist:
+                # set_otp() writes only the OTP columns, so nothing else is loaded
+                profile = Profile.objects.only('id').get(user__email=email)
+            except Profile.DoesNotExist:
                 return Response({'error': 'User with this email does not exist.'}, status=status.HTTP_404_NOT_FOUND)
+            if not start_otp_cooldown(email, OTP_PURPOSE_VERIFICATION):
+                return Response({'error': 'An OTP was sent recently. Please wait before requesting another.'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+            otp = generate_otp()
+            profile.set_otp(otp)
+
+            if not submit_otp(email, 'Your new OTP', f'Your new OTP is: {otp}'):
+                return _otp_not_sent_response(email, OTP_PURPOSE_VERIFICATION)
+            return Response({'message': 'A new OTP has been sent to your email.'}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class RegisterView(generics.CreateAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
+    throttle_classes = [OTPIPRateThrottle, OTPEmailRateThrottle]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        if not serializer.otp_sent:
+            # The account exists; the user can ask for a new OTP from the verify page
+            return Response({'error': OTP_NOT_SENT_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 class VerifyOTPView(APIView):
     def post(self, request):
@@ -52,18 +71,23 @@ class VerifyOTPView(APIView):
             email = serializer.validated_data['email']
             otp = serializer.validated_data['otp']
             try:
-                profile = Profile.objects.get(user__email=email)
-                if profile.otp == otp:
+                profile = Profile.objects.only(
+                    'id', 'user_id', 'otp_hash', 'otp_expires_at'
+                ).get(user__email=email)
+                if profile.check_otp(otp):
                     profile.is_verified = True
-                    profile.save()
+                    profile.save(update_fields=['is_verified'])
+                    mark_verified(profile.user_id)
                     return Response({'message': 'OTP verified successfully.'}, status=status.HTTP_200_OK)
                 else:
-                    return Response({'error': 'Invalid OTP.'}, status=status.HTTP_400_BAD_REQUEST)
+                    return Response({'error': 'Invalid or expired OTP.'}, status=status.HTTP_400_BAD_REQUEST)
             except Profile.DoesNotExist:
                 return Response({'error': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class CustomTokenObtainPairView(TokenObtainPairView):
+    throttle_classes = [OTPIPRateThrottle, OTPEmailRateThrottle]
+
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         
@@ -73,51 +97,51 @@ class CustomTokenObtainPairView(TokenObtainPairView):
             return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
         user = serializer.user
-        if not user.profile.is_verified:
+        if not is_verified(user.id):
+            if not start_otp_cooldown(user.email, OTP_PURPOSE_VERIFICATION):
+                return Response({
+                    'error': 'otp_not_verified',
+                    'message': 'An OTP was sent to your email recently. Please verify your OTP before logging in.',
+                    'redirect_url': '/accounts/verify-otp/'
+                }, status=status.HTTP_403_FORBIDDEN)
+
             # Generate and send a new OTP
-            otp = str(random.randint(100000, 999999))
-            user.profile.otp = otp
-            user.profile.save()
-
-            send_mail(
-                'New OTP for Verification',
-                f'Your new OTP is: {otp}',
-                settings.EMAIL_HOST_USER,
-                [user.email],
-                fail_silently=False,
-            )
+            otp = generate_otp()
+            user.profile.set_otp(otp)
+
+            if not submit_otp(user.email, 'New OTP for Verification', f'Your new OTP is: {otp}'):
+                return _otp_not_sent_response(user.email, OTP_PURPOSE_VERIFICATION)
 
             return Response({
                 'error': 'otp_not_verified',
                 'message': 'A new OTP has been sent to your email. Please verify your OTP before logging in.',
                 'redirect_url': '/accounts/verify-otp/'
             }, status=status.HTTP_403_FORBIDDEN)
-            
-        return super().post(request, *args, **kwargs)
+
+        # The serializer already issued the token pair; don't authenticate again
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 class ForgotPasswordView(APIView):
+    throttle_classes = [OTPIPRateThrottle, OTPEmailRateThrottle]
+
     def post(self, request):
         serializer = ForgotPasswordSerializer(data=request.data)
         if serializer.is_valid():
             email = serializer.validated_data['email']
             try:
-                user = CustomUser.objects.get(email=email)
-                profile = user.profile
-                
-                otp = str(random.randint(100000, 999999))
-                profile.otp = otp
-                profile.save()
-                
-                send_mail(
-                    'Password Reset OTP',
-                    f'Your OTP to reset your password is: {otp}',
-                    settings.EMAIL_HOST_USER,
-                    [email],
-                    fail_silently=False,
-                )
-                return Response({'message': 'OTP for password reset sent to your email.'}, status=status.HTTP_200_OK)
-            except CustomUser.DoesNotExist:
+                # set_otp() writes only the OTP columns, so nothing else is loaded
+                profile = Profile.objects.only('id').get(user__email=email)
+            except Profile.DoesNotExist:
                 return Response({'error': 'User with this email does not exist.'}, status=status.HTTP_404_NOT_FOUND)
+            if not start_otp_cooldown(email, OTP_PURPOSE_PASSWORD_RESET):
+                return Response({'error': 'An OTP was sent recently. Please wait before requesting another.'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+            otp = generate_otp()
+            profile.set_otp(otp)
+
+            if not submit_otp(email, 'Password Reset OTP', f'Your OTP to reset your password is: {otp}'):
+                return _otp_not_sent_response(email, OTP_PURPOSE_PASSWORD_RESET)
+            return Response({'message': 'OTP for password reset sent to your email.'}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class VerifyPasswordResetOTPView(APIView):
@@ -127,13 +151,15 @@ class VerifyPasswordResetOTPView(APIView):
             email = serializer.validated_data['email']
             otp = serializer.validated_data['otp']
             try:
-                profile = Profile.objects.get(user__email=email)
-                if profile.otp == otp:
+                profile = Profile.objects.only(
+                    'id', 'otp_hash', 'otp_expires_at'
+                ).get(user__email=email)
+                if profile.check_otp(otp):
                     profile.otp_verified_for_password_reset = True
-                    profile.save()
+                    profile.save(update_fields=['otp_verified_for_password_reset'])
                     return Response({'message': 'OTP verified successfully.'}, status=status.HTTP_200_OK)
                 else:
-                    return Response({'error': 'Invalid OTP.'}, status=status.HTTP_400_BAD_REQUEST)
+                    return Response({'error': 'Invalid or expired OTP.'}, status=status.HTTP_400_BAD_REQUEST)
             except Profile.DoesNotExist:
                 return Response({'error': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -150,17 +176,20 @@ class ResetPasswordView(APIView):
             email = serializer.validated_data['email']
             password = serializer.validated_data['password']
             try:
-                profile = Profile.objects.get(user__email=email)
+                profile = Profile.objects.select_related('user').only(
+                    'id', 'otp_verified_for_password_reset', 'user__id', 'user__password'
+                ).get(user__email=email)
                 if not profile.otp_verified_for_password_reset:
                     return Response({'error': 'Please verify your OTP first.'}, status=status.HTTP_400_BAD_REQUEST)
                 
                 user = profile.user
                 user.set_password(password)
-                user.save()
+                user.save(update_fields=['password'])
                 
-                profile.otp = None
+                profile.otp_hash = None
+                profile.otp_expires_at = None
                 profile.otp_verified_for_password_reset = False
-                profile.save()
+                profile.save(update_fields=['otp_hash', 'otp_expires_at', 'otp_verified_for_password_reset'])
                 
                 return Response({'message': 'Password reset successfully.'}, status=status.HTTP_200_OK)
             except Profile.DoesNotExist:
@@ -183,19 +212,15 @@ def user_login(request):
         password = request.POST.get('password')
         user = authenticate(request, email=email, password=password)
         if user is not None:
-            if not user.profile.is_verified:
-                # Generate and send a new OTP (optional, but good practice)
-                otp = str(random.randint(100000, 999999))
-                user.profile.otp = otp
-                user.profile.save()
-
-                send_mail(
-                    'New OTP for Verification',
-                    f'Your new OTP is: {otp}',
-                    settings.EMAIL_HOST_USER,
-                    [user.email],
-                    fail_silently=False,
-                )
+            if not is_verified(user.id):
+                # Generate and send a new OTP unless one went out moments ago
+                if start_otp_cooldown(user.email, OTP_PURPOSE_VERIFICATION):
+                    otp = generate_otp()
+                    user.profile.set_otp(otp)
+
+                    if not submit_otp(user.email, 'New OTP for Verification', f'Your new OTP is: {otp}'):
+                        end_otp_cooldown(user.email, OTP_PURPOSE_VERIFICATION)
+                        return render(request, 'accounts/login.html', {'error_message': OTP_NOT_SENT_ERROR})
                 # Store email in session to retrieve on OTP verification page
                 request.session['unverified_email'] = email
                 return redirect('verify_otp_page')
@@ -1,6 +1,18 @@
+import os
 from django.apps import AppConfig
 
 
 class RagCoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rag_core'
+
+    def ready(self):
+        # Absorb the first-call JIT cost of the OCR preprocessing kernel
+        from .image_ops import warmup
+        warmup()
+
+        # Optionally build the RAG pipeline at startup, e.g. under
+        # "gunicorn --preload" so workers share the loaded models copy-on-write
+        if os.getenv('RAG_PRELOAD'):
+            from .rag_pipeline import get_rag_pipeline
+            get_rag_pipeline()
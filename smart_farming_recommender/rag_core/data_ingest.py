@@ -1,10 +1,79 @@
+import hashlib
 import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 # from dotenv import load_dotenv # Uncomment if you need to load .env variables here
 
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from rag_core.embeddings import get_embeddings
+from rag_core.keyword_index import get_keyword_index
+from rag_core.sqlite_store import USE_SQLITE_VEC, get_sqlite_store
+
+def _load_one(file_path):
+    # Runs in a worker process; PDF parsing is CPU-bound
+    filename = os.path.basename(file_path)
+    if filename.endswith('.pdf'):
+        print(f'Loading PDF: {filename}...')
+        return PyPDFLoader(file_path).load()
+    if filename.endswith('.txt'):
+        print(f'Loading Text: {filename}...')
+        return TextLoader(file_path).load()
+    return []
+
+def _file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _open_manifest(persist_directory):
+    # Records the hash of every source file already embedded into Chroma
+    os.makedirs(persist_directory, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(persist_directory, 'ingested_files.sqlite3'))
+    conn.execute('CREATE TABLE IF NOT EXISTS ingested_files (path TEXT PRIMARY KEY, sha256 TEXT NOT NULL)')
+    return conn
+
+def _open_sqlite_store():
+    # The sqlite-vec index is kept in step with Chroma so RAG_USE_SQLITE_VEC can
+    # be flipped at any time, as long as the extension is available here
+    try:
+        return get_sqlite_store()
+    except (ImportError, AttributeError) as e:
+        # AttributeError: this Python's sqlite3 can't load extensions
+        if USE_SQLITE_VEC:
+            raise
+        print(f'Skipping the sqlite-vec index: {e}')
+        return None
+
+def _chroma_chunks(persist_directory):
+    # Every chunk already in Chroma, with its stored embedding
+    stored = Chroma(persist_directory=persist_directory, embedding_function=get_embeddings()).get(
+        include=['documents', 'metadatas', 'embeddings']
+    )
+    documents = [
+        Document(page_content=text, metadata=metadata or {})
+        for text, metadata in zip(stored['documents'], stored['metadatas'])
+    ]
+    return documents, stored['embeddings']
+
+def _backfill_indexes(keyword_index, sqlite_store, persist_directory):
+    # Indexes added after the first ingestion start out empty, and the manifest
+    # would skip re-reading every unchanged file, so copy their chunks from Chroma
+    fill_keyword_index = keyword_index.is_empty()
+    fill_sqlite_store = sqlite_store is not None and sqlite_store.is_empty()
+    if not fill_keyword_index and not fill_sqlite_store:
+        return
+    documents, vectors = _chroma_chunks(persist_directory)
+    if fill_keyword_index:
+        keyword_index.add_documents(documents)
+        print(f'Backfilled the keyword index with {len(documents)} chunks from Chroma.')
+    if fill_sqlite_store:
+        sqlite_store.add_embedded_documents(documents, vectors)
+        print(f'Backfilled the sqlite-vec index with {len(documents)} chunks from Chroma.')
 
 def ingest_data():
     print('Starting document ingestion...')
@@ -14,45 +83,76 @@ def ingest_data():
     # For now, hardcode relative to the script's location
     app_dir = os.path.dirname(os.path.abspath(__file__))
     data_path = os.path.join(app_dir, 'data')
-    documents = []
-
-    # Load documents from the data directory
-    for filename in os.listdir(data_path):
-        file_path = os.path.join(data_path, filename)
-        if filename.endswith('.pdf'):
-            print(f'Loading PDF: {filename}...')
-            loader = PyPDFLoader(file_path)
-            documents.extend(loader.load())
-        elif filename.endswith('.txt'):
-            print(f'Loading Text: {filename}...')
-            from langchain_community.document_loaders import TextLoader
-            loader = TextLoader(file_path)
-            documents.extend(loader.load())
-    
-    if not documents:
+    persist_directory = os.path.join(app_dir, 'chroma_db')
+
+    file_paths = [
+        os.path.join(data_path, filename) for filename in os.listdir(data_path)
+        if filename.endswith(('.pdf', '.txt'))
+    ]
+    if not file_paths:
         print('No PDF documents found in the data directory. Please add some PDFs to rag_core/data/')
         return
 
+    # Only re-embed files that are new or whose contents changed since the last run
+    manifest = _open_manifest(persist_directory)
+    known_hashes = dict(manifest.execute('SELECT path, sha256 FROM ingested_files'))
+    changed = {}
+    for file_path in file_paths:
+        sha256 = _file_sha256(file_path)
+        if known_hashes.get(file_path) != sha256:
+            changed[file_path] = sha256
+    removed = [path for path in known_hashes if path not in file_paths]
+
+    keyword_index = get_keyword_index()
+    sqlite_store = _open_sqlite_store()
+    if known_hashes:
+        _backfill_indexes(keyword_index, sqlite_store, persist_directory)
+
+    if not changed and not removed:
+        print('All documents are already up to date.')
+        manifest.close()
+        return
+
+    # Load documents from the data directory, one file per worker process
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_load_one, changed))
+    documents = [doc for docs in results for doc in docs]
+
     # Split documents into chunks
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
     chunks = text_splitter.split_documents(documents)
     print(f'Split {len(documents)} documents into {len(chunks)} chunks.')
 
-    # Create embeddings and store in Chroma
-    # Using the specified multi-modal embedding model
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-    
-    # Persist the Chroma vector store
-    persist_directory = os.path.join(app_dir, 'chroma_db')
-    vectorstore = Chroma.from_documents(
-        documents=chunks,
-        embedding=embeddings,
-        persist_directory=persist_directory
-    )
+    # Open the persisted Chroma vector store
+    vectorstore = Chroma(persist_directory=persist_directory, embedding_function=get_embeddings())
+
+    # Drop chunks from earlier versions of changed files and from deleted files
+    stale_sources = list(changed) + removed
+    stale_ids = vectorstore.get(where={'source': {'$in': stale_sources}})['ids']
+    if stale_ids:
+        vectorstore.delete(ids=stale_ids)
+
+    if chunks:
+        vectorstore.add_documents(chunks)
     vectorstore.persist()
 
-    print(f'Successfully ingested documents into Chroma DB at {persist_directory}')
+    keyword_index.delete_sources(stale_sources)
+    if chunks:
+        keyword_index.add_documents(chunks)
+
+    if sqlite_store is not None:
+        sqlite_store.delete_sources(stale_sources)
+        if chunks:
+            sqlite_store.add_documents(chunks)
+
+    manifest.executemany('INSERT OR REPLACE INTO ingested_files (path, sha256) VALUES (?, ?)', changed.items())
+    manifest.executemany('DELETE FROM ingested_files WHERE path = ?', [(path,) for path in removed])
+    manifest.commit()
+    manifest.close()
+
+    print(f'Ingested {len(changed)} changed file(s) and removed {len(removed)} into Chroma DB at {persist_directory}')
 
 if __name__ == '__main__':
+    # Run from the project directory: python -m rag_core.data_ingest
     # load_dotenv() # Uncomment if you need to load .env variables here
     ingest_data()
@@ -1,8 +1,12 @@
+import hashlib
+from functools import lru_cache
 import torch
 import torchvision
-from torchvision import transforms
+from torchvision.io import ImageReadMode, read_image
+from torchvision.transforms import v2
 from PIL import Image
 import torch.nn as nn
+from django.conf import settings
 
 # Define the model architecture.
 # I am assuming a ResNet-18 architecture with a modified final layer.
@@ -36,16 +40,98 @@ def load_model(model_path):
     model.eval()
     return model
 
+# Load the INT8 TorchScript model produced by rag_core/quantize_model.py
+def load_quantized_model(model_path):
+    torch.backends.quantized.engine = 'fbgemm'
+    model = torch.jit.load(model_path, map_location=torch.device('cpu'))
+    model.eval()
+    return model
+
+def _verify_checksum(model_path, expected_sha256):
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    if digest.hexdigest() != expected_sha256.lower():
+        raise ValueError(f"Checksum mismatch for model file {model_path}")
+
+# Load the model once per process and reuse it for every prediction
+@lru_cache(maxsize=1)
+def _get_model(model_path, quantized=False):
+    expected_sha256 = getattr(settings, 'DISEASE_MODEL_SHA256', None)
+    if expected_sha256:
+        _verify_checksum(model_path, expected_sha256)
+    if quantized:
+        return load_quantized_model(model_path)
+    model = load_model(model_path)
+    # Trace and freeze in channels_last so conv/bn/relu get fused onto oneDNN kernels
+    example = torch.zeros(1, 3, 224, 224).contiguous(memory_format=torch.channels_last)
+    model = model.to(memory_format=torch.channels_last)
+    with torch.no_grad():
+        model = torch.jit.trace(model, example)
+    return torch.jit.freeze(model)
+
+# Tensor-only preprocessing pipeline, built once at import
+_TRANSFORM = v2.Compose([
+    v2.Resize(256, antialias=True),
+    v2.CenterCrop(224),
+    v2.ToDtype(torch.float32, scale=True),
+    v2.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+])
+
+# Build the ONNX Runtime session once per process
+@lru_cache(maxsize=1)
+def _get_onnx_session(model_path):
+    import onnxruntime as ort
+    expected_sha256 = getattr(settings, 'DISEASE_MODEL_SHA256', None)
+    if expected_sha256:
+        _verify_checksum(model_path, expected_sha256)
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+
 # Preprocess the image
 def preprocess_image(image_path):
-    transform = transforms.Compose([
-        transforms.Resize(256),
-        transforms.CenterCrop(224),
-        transforms.ToTensor(),
-        transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
-    ])
-    image = Image.open(image_path).convert('RGB')
-    return transform(image).unsqueeze(0)
+    # Decode straight into a uint8 tensor instead of going through PIL
+    try:
+        image = read_image(image_path, mode=ImageReadMode.RGB)
+    except (RuntimeError, ValueError):
+        # torchvision only decodes JPEG/PNG/GIF (and WebP in newer releases);
+        # PIL still handles BMP, TIFF, palette/CMYK and the rest
+        with Image.open(image_path) as pil_image:
+            image = v2.functional.pil_to_tensor(pil_image.convert('RGB'))
+    return _TRANSFORM(image).unsqueeze(0).contiguous(memory_format=torch.channels_last)
+
+# Run the configured model on a preprocessed batch and return class indices
+def _classify_batch(batch):
+    onnx_path = getattr(settings, 'DISEASE_MODEL_ONNX_PATH', None)
+    if onnx_path:
+        session = _get_onnx_session(onnx_path)
+        outputs = session.run(None, {'input': batch.contiguous().numpy()})[0]
+        return outputs.argmax(axis=1).tolist()
+
+    quantized_path = getattr(settings, 'DISEASE_MODEL_INT8_PATH', None)
+    if quantized_path:
+        model = _get_model(quantized_path, quantized=True)
+    else:
+        model = _get_model(settings.DISEASE_MODEL_PATH)
+    with torch.inference_mode():
+        return model(batch).argmax(1).tolist()
+
+# Predict diseases for several images at once
+def predict_diseases(image_paths):
+    """
+    Predicts the diseases for several images with a single batched forward pass.
+
+    Args:
+        image_paths (list[str]): The paths to the image files.
+
+    Returns:
+        list[str]: The predicted disease name for each image, in input order.
+    """
+    batch = torch.cat([preprocess_image(path) for path in image_paths])
+    batch = batch.contiguous(memory_format=torch.channels_last)
+    return [CLASS_NAMES[i] for i in _classify_batch(batch)]
 
 # Predict the disease
 def predict_disease(image_path):
@@ -59,14 +145,7 @@ def predict_disease(image_path):
         str: The predicted disease name.
     """
     try:
-        model_path = '/Users/ishantsingh/CPS_PROJECT/plant_disease_model_1_latest.pt'
-        model = load_model(model_path)
-        image_tensor = preprocess_image(image_path)
-        with torch.no_grad():
-            outputs = model(image_tensor)
-            _, predicted = torch.max(outputs, 1)
-            disease_name = CLASS_NAMES[predicted.item()]
-        return disease_name
+        return predict_diseases([image_path])[0]
     except Exception as e:
         print(f"Error predicting disease: {e}")
         return "Could not predict the disease."
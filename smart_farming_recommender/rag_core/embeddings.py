@@ -0,0 +1,129 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIMENSIONS = 384
+# "torch" (default) or "onnx" for the int8-quantized ONNX Runtime model
+EMBEDDINGS_BACKEND = os.getenv("RAG_EMBEDDINGS_BACKEND", "torch").lower()
+
+# Query embeddings shared by every embeddings instance in the process
+QUERY_CACHE_SIZE = 2048
+_query_cache = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+def _cached_embed_query(model_name, text, embed):
+    """
+    Returns embed(normalized_text) through the process-wide LRU, keyed by the
+    SHA-256 of the model name and whitespace-normalized query text.
+    """
+    normalized = " ".join(text.split())
+    key = hashlib.sha256(f"{model_name}\0{normalized}".encode()).hexdigest()
+    with _query_cache_lock:
+        vector = _query_cache.get(key)
+        if vector is not None:
+            _query_cache.move_to_end(key)
+            return vector
+
+    vector = embed(normalized)
+    with _query_cache_lock:
+        _query_cache[key] = vector
+        if len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return vector
+
+class CachedEmbeddings(HuggingFaceEmbeddings):
+    """
+    HuggingFaceEmbeddings with an LRU cache over embed_query, keyed by the
+    SHA-256 of the whitespace-normalized query text.
+    """
+
+    def embed_query(self, text):
+        return _cached_embed_query(self.model_name, text, super().embed_query)
+
+class OnnxMiniLMEmbeddings(Embeddings):
+    """
+    The same sentence-transformers model exported to ONNX and dynamically
+    quantized to int8, run on ONNX Runtime's CPU provider.
+
+    The quantized model is written to cache_dir on first use and loaded from
+    there afterwards.
+    """
+
+    def __init__(self, model_name, cache_dir, batch_size=128, max_length=256):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        quantized_file = os.path.join(cache_dir, "model_quantized.onnx")
+        if not os.path.exists(quantized_file):
+            exported = ORTModelForFeatureExtraction.from_pretrained(
+                model_name, export=True, provider="CPUExecutionProvider"
+            )
+            quantizer = ORTQuantizer.from_pretrained(exported)
+            quantizer.quantize(
+                save_dir=cache_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(cache_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(cache_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            cache_dir, file_name="model_quantized.onnx", provider="CPUExecutionProvider"
+        )
+
+    def _embed(self, texts):
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            hidden = self.model(**encoded).last_hidden_state
+            # Mean-pool over real tokens, then L2-normalize, as sentence-transformers does
+            mask = encoded["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.extend(pooled.tolist())
+        return vectors
+
+    def embed_documents(self, texts):
+        return self._embed(list(texts))
+
+    def embed_query(self, text):
+        return _cached_embed_query(self.model_name, text, lambda normalized: self._embed([normalized])[0])
+
+@lru_cache(maxsize=1)
+def get_embeddings(model_name=EMBEDDING_MODEL_NAME):
+    """
+    Returns the process-wide embedding model, loading it on first use.
+
+    Ingestion and retrieval share this instance so the weights and tokenizer
+    are only initialized once per process. RAG_EMBEDDINGS_BACKEND=onnx selects
+    the int8 ONNX Runtime model instead of PyTorch.
+    """
+    if EMBEDDINGS_BACKEND == "onnx":
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        cache_dir = os.path.join(app_dir, "onnx_models", model_name.replace("/", "__"))
+        return OnnxMiniLMEmbeddings(model_name, cache_dir)
+
+    # Imported here so the ONNX backend, and processes that never embed, don't load torch
+    import torch
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return CachedEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device},
+        encode_kwargs={"batch_size": 128, "normalize_embeddings": True},
+    )
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import torch
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+from rag_core.disease_predictor import load_model, preprocess_image
+from rag_core.quantize_model import IMAGE_EXTENSIONS
+
+class _LeafImageReader(CalibrationDataReader):
+    def __init__(self, image_paths):
+        self._inputs = iter(
+            {'input': preprocess_image(path).contiguous().numpy()} for path in image_paths
+        )
+
+    def get_next(self):
+        return next(self._inputs, None)
+
+def export_onnx(fp32_path, output_path, calibration_dir=None, max_images=100):
+    """
+    Exports the disease model to ONNX, and optionally writes a QDQ INT8 copy
+    calibrated on sample leaf images next to it.
+
+    Args:
+        fp32_path (str): Path to the FP32 state dict.
+        output_path (str): Where to write the FP32 ONNX model.
+        calibration_dir (str): Optional directory of images for INT8 calibration.
+        max_images (int): Maximum number of calibration images to use.
+    """
+    print('Exporting FP32 model to ONNX...')
+    model = load_model(fp32_path)
+    torch.onnx.export(
+        model,
+        torch.randn(1, 3, 224, 224),
+        output_path,
+        input_names=['input'],
+        output_names=['logits'],
+        opset_version=17,
+        dynamic_axes={'input': {0: 'N'}, 'logits': {0: 'N'}},
+    )
+    print(f'Saved ONNX model to {output_path}')
+
+    if not calibration_dir:
+        return
+
+    images = [
+        os.path.join(calibration_dir, f) for f in sorted(os.listdir(calibration_dir))
+        if f.lower().endswith(IMAGE_EXTENSIONS)
+    ][:max_images]
+    if not images:
+        print(f'No calibration images found in {calibration_dir}.')
+        return
+
+    int8_path = os.path.splitext(output_path)[0] + '_int8.onnx'
+    print(f'Quantizing to INT8 with {len(images)} calibration images...')
+    quantize_static(
+        output_path,
+        int8_path,
+        _LeafImageReader(images),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+    print(f'Saved INT8 ONNX model to {int8_path}')
+
+if __name__ == '__main__':
+    # Usage: python -m rag_core.export_onnx <fp32_weights.pt> <output.onnx> [calibration_dir]
+    if len(sys.argv) not in (3, 4):
+        print('Usage: python -m rag_core.export_onnx <fp32_weights.pt> <output.onnx> [calibration_dir]')
+        sys.exit(1)
+    export_onnx(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) == 4 else None)
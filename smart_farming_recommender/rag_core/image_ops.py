@@ -0,0 +1,50 @@
+import numpy as np
+from numba import njit
+
+# The kernels are serial: they run on the views' OCR pool threads, which
+# already provide the parallelism (and numba's default threading layer
+# aborts on concurrent parallel calls from several threads)
+
+@njit(cache=True, fastmath=True)
+def _preprocess_rgb(arr):
+    """
+    Converts an (H, W, 3) uint8 RGB array to (H, W) uint8 grayscale using
+    ITU-R BT.601 luma weights, which is what tesseract expects as input.
+    """
+    height, width = arr.shape[0], arr.shape[1]
+    out = np.empty((height, width), dtype=np.uint8)
+    for y in range(height):
+        for x in range(width):
+            luma = 0.299 * arr[y, x, 0] + 0.587 * arr[y, x, 1] + 0.114 * arr[y, x, 2]
+            out[y, x] = np.uint8(min(luma + 0.5, 255.0))
+    return out
+
+@njit(cache=True)
+def _autocontrast(gray):
+    """
+    Stretches an (H, W) uint8 image so its darkest pixel maps to 0 and its
+    brightest to 255, like PIL's ImageOps.autocontrast with no cutoff.
+    """
+    lo = float(gray.min())
+    hi = float(gray.max())
+    height, width = gray.shape
+    out = np.empty((height, width), dtype=np.uint8)
+    if hi <= lo:
+        out[:, :] = gray
+        return out
+    scale = 255.0 / (hi - lo)
+    for y in range(height):
+        for x in range(width):
+            out[y, x] = np.uint8((gray[y, x] - lo) * scale + 0.5)
+    return out
+
+def warmup():
+    """
+    Compiles (or loads from the on-disk cache) the kernels so the first
+    request does not pay the JIT cost.
+    """
+    # np.asarray(PIL image) is read-only, which numba compiles as a separate
+    # signature from a writable array
+    rgb = np.zeros((2, 2, 3), dtype=np.uint8)
+    rgb.setflags(write=False)
+    _autocontrast(_preprocess_rgb(rgb))
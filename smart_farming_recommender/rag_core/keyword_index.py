@@ -0,0 +1,73 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from langchain_core.documents import Document
+
+def default_index_path():
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(app_dir, 'chroma_db', 'keyword_index.sqlite3')
+
+class KeywordIndex:
+    """
+    Knowledge-base chunks in an SQLite FTS5 table for BM25 keyword search.
+
+    Only needs the standard sqlite3 module, so hybrid retrieval works whether
+    or not the sqlite-vec store is enabled.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by the graph's worker threads, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS keyword_chunks '
+            'USING fts5(content, source UNINDEXED, metadata UNINDEXED)'
+        )
+
+    def add_documents(self, documents):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO keyword_chunks (content, source, metadata) VALUES (?, ?, ?)',
+                [(doc.page_content, doc.metadata.get('source', ''), json.dumps(doc.metadata)) for doc in documents],
+            )
+
+    def delete_sources(self, sources):
+        """
+        Removes every chunk that was split from one of the given source files.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM keyword_chunks WHERE source = ?', [(source,) for source in sources])
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM keyword_chunks LIMIT 1').fetchone() is None
+
+    def keyword_search(self, query, k=4):
+        """
+        Returns up to k chunks matching any term of the query, best BM25 rank first.
+        """
+        # Quote every term so user input can't be parsed as FTS5 query syntax
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT content, metadata
+                FROM keyword_chunks
+                WHERE keyword_chunks MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (match, k),
+            ).fetchall()
+        return [Document(page_content=content, metadata=json.loads(metadata)) for content, metadata in rows]
+
+@lru_cache(maxsize=1)
+def get_keyword_index(path=None):
+    return KeywordIndex(path or default_index_path())
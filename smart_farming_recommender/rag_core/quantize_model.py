@@ -0,0 +1,56 @@
+import os
+import sys
+
+import torch
+import torch.nn as nn
+from torchvision.models.quantization import resnet18 as quantizable_resnet18
+
+from rag_core.disease_predictor import CLASS_NAMES, preprocess_image
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+def quantize_model(fp32_path, calibration_dir, output_path, max_images=100):
+    """
+    Converts the FP32 disease model to an INT8 TorchScript model using
+    post-training static quantization (FBGEMM backend).
+
+    Args:
+        fp32_path (str): Path to the FP32 state dict.
+        calibration_dir (str): Directory of sample leaf images used to calibrate activations.
+        output_path (str): Where to write the quantized TorchScript model.
+        max_images (int): Maximum number of calibration images to use.
+    """
+    print('Loading FP32 weights...')
+    model = quantizable_resnet18(weights=None, quantize=False)
+    model.fc = nn.Linear(model.fc.in_features, len(CLASS_NAMES))
+    model.load_state_dict(torch.load(fp32_path, map_location=torch.device('cpu')))
+    model.eval()
+    model.fuse_model()
+
+    torch.backends.quantized.engine = 'fbgemm'
+    model.qconfig = torch.ao.quantization.get_default_qconfig('fbgemm')
+    prepared = torch.ao.quantization.prepare(model)
+
+    images = [
+        f for f in sorted(os.listdir(calibration_dir))
+        if f.lower().endswith(IMAGE_EXTENSIONS)
+    ][:max_images]
+    if not images:
+        print(f'No calibration images found in {calibration_dir}.')
+        return
+
+    print(f'Calibrating on {len(images)} images...')
+    with torch.no_grad():
+        for filename in images:
+            prepared(preprocess_image(os.path.join(calibration_dir, filename)))
+
+    quantized = torch.ao.quantization.convert(prepared)
+    torch.jit.save(torch.jit.script(quantized), output_path)
+    print(f'Saved INT8 model to {output_path}')
+
+if __name__ == '__main__':
+    # Usage: python -m rag_core.quantize_model <fp32_weights.pt> <calibration_dir> <output.pt>
+    if len(sys.argv) != 4:
+        print('Usage: python -m rag_core.quantize_model <fp32_weights.pt> <calibration_dir> <output.pt>')
+        sys.exit(1)
+    quantize_model(sys.argv[1], sys.argv[2], sys.argv[3])
@@ -1,20 +1,23 @@
 import warnings
+import hashlib
+import math
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pybase64
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
-from langchain_core.runnables import RunnablePassthrough
 from langchain_core.messages import HumanMessage, SystemMessage
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional
 from typing_extensions import TypedDict
-from langgraph.graph import END, StateGraph
-from langchain_community.tools.tavily_search import TavilySearchResults
-from .disease_predictor import predict_disease
-import base64
-import tempfile
+from langgraph.graph import END, START, StateGraph
+from .embeddings import get_embeddings
+from .keyword_index import get_keyword_index
+from .sqlite_store import USE_SQLITE_VEC, get_sqlite_store, relevance_score as sqlite_relevance_score
 
 # Suppress LangChainDeprecationWarning
 warnings.filterwarnings("ignore", category=DeprecationWarning, module='langchain')
@@ -22,32 +25,99 @@ warnings.filterwarnings("ignore", category=DeprecationWarning, module='langchain
 # --- 1. Load environment and initialize components ---
 load_dotenv()
 
-# Check for GOOGLE_API_KEY
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set. Please set it in your .env file.")
+# Prompts are built once at import; the chains that bind them to the LLM are
+# built once in _build_app()
+GRADE_GENERATION_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", 'You are a grader assessing whether an answer is grounded in / supported by a set of facts. Give a binary "yes" or "no" score to indicate whether the answer is grounded in the provided facts. Provide the binary score as a JSON with a single key "score".'),
+        ("user", "Retrieved facts:\n\n{facts}\n\nGenerated answer:\n{generation}\n\nAnswer the question: Is the generated answer grounded in the retrieved facts?"),
+    ]
+)
+
+TRANSFORM_QUERY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are a query transformation expert. Your task is to rewrite the user's question to be more specific and easier to answer, based on the previously retrieved information (documents and/or web search results). Do not generate an answer, only a better question."),
+    ("user", "Original question: {question}\n\nPreviously retrieved information (may be irrelevant):\n{context}\n\nRewrite the question to improve the chances of retrieving relevant information."),
+])
+
+class _RagComponents(NamedTuple):
+    app: object
+    llm: ChatGoogleGenerativeAI
+    embeddings: object
+    vectorstore: object
+    relevance_score: object # Converts the vector store's distances to 0..1 scores
+    keyword_index: object
+    tavily_tool: object # None when TAVILY_API_KEY is not set
+    grade_generation_chain: object
+    transform_query_chain: object
+
+_components = None
+_components_lock = threading.Lock()
+
+def _build_app():
+    """
+    Returns the process-wide components, building them on first use.
+
+    Runs the build once per process, so importing this module (e.g. from a
+    management command) does not load models or call the LLM. The lock keeps
+    concurrent first requests from building twice.
+    """
+    global _components
+    if _components is None:
+        with _components_lock:
+            if _components is None:
+                _components = _create_components()
+    return _components
+
+def _create_components():
+    """
+    Initializes the LLM, vector store and search tool and compiles the graph.
+    """
+    # Check for GOOGLE_API_KEY
+    if not os.getenv("GOOGLE_API_KEY"):
+        raise ValueError("GOOGLE_API_KEY environment variable not set. Please set it in your .env file.")
 
-# Check for TAVILY_API_KEY
-if not os.getenv("TAVILY_API_KEY"):
-    print("Warning: TAVILY_API_KEY environment variable not set. Web search functionality will be limited.")
 
-# Initialize LLM
-try:
+    # Initialize LLM
     llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0, convert_system_message_to_human=True)
-    # Test if the model is available
-    llm.invoke("Hello")
-except Exception as e:
-    raise e # If gemini-pro-vision fails, something is seriously wrong.
-# Initialize Embeddings
-embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-
-# Load Vector Store
-app_dir = os.path.dirname(os.path.abspath(__file__))
-persist_directory = os.path.join(app_dir, 'chroma_db')
-vectorstore = Chroma(persist_directory=persist_directory, embedding_function=embeddings)
-retriever = vectorstore.as_retriever()
-
-# Initialize Tavily Search Tool
-tavily_tool = TavilySearchResults(max_results=5)
+    if os.getenv("RAG_HEALTHCHECK"):
+        # Optional liveness probe; costs one extra Gemini round-trip per process
+        llm.invoke("Hello")
+
+    # Initialize Embeddings
+    embeddings = get_embeddings()
+
+    # Load Vector Store; the sqlite-vec index is opt-in, Chroma remains the default
+    if USE_SQLITE_VEC:
+        vectorstore = get_sqlite_store()
+        relevance_score = sqlite_relevance_score
+    else:
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        persist_directory = os.path.join(app_dir, 'chroma_db')
+        vectorstore = Chroma(persist_directory=persist_directory, embedding_function=embeddings)
+        relevance_score = _chroma_relevance_score
+
+    # FTS5 keyword index, populated alongside the vector stores by data_ingest
+    keyword_index = get_keyword_index()
+
+    # Initialize Tavily Search Tool; only imported when it is configured
+    if os.getenv("TAVILY_API_KEY"):
+        from langchain_community.tools.tavily_search import TavilySearchResults
+        tavily_tool = TavilySearchResults(max_results=5)
+    else:
+        print("Warning: TAVILY_API_KEY environment variable not set. Web search functionality will be limited.")
+        tavily_tool = None
+
+    return _RagComponents(
+        app=workflow.compile(),
+        llm=llm,
+        embeddings=embeddings,
+        vectorstore=vectorstore,
+        relevance_score=relevance_score,
+        keyword_index=keyword_index,
+        tavily_tool=tavily_tool,
+        grade_generation_chain=GRADE_GENERATION_PROMPT | llm | JsonOutputParser(),
+        transform_query_chain=TRANSFORM_QUERY_PROMPT | llm | StrOutputParser(),
+    )
 
 # --- 2. Define the State for our LangGraph Agent ---
 class GraphState(TypedDict):
@@ -62,8 +132,14 @@ class GraphState(TypedDict):
         iteration: The number of cycles completed.
         decision: The decision made by the grader (e.g., "continue", "web_search", "finish", "re-try", "relevant", "irrelevant").
         classification: The classification of the user's question (e.g., "farming", "political", "other").
+        text_question: The text parts of the question joined once, for retrieval and grading.
+        question_embedding: The embedding of text_question, if the caller computed it already.
+        image_path: Path of an image uploaded with the question, if any.
     """
     question: List[Dict] # Changed from str to List[Dict]
+    text_question: str
+    question_embedding: Optional[List[float]]
+    image_path: Optional[str]
     generation: str
     documents: List[str]
     web_search_results: List[str]
@@ -72,71 +148,135 @@ class GraphState(TypedDict):
 
 # --- 3. Define the Nodes of the Graph ---
 
-def retrieve_documents(state):
+def _join_text_parts(messages):
+    return " ".join(part["text"] for part in messages if part["type"] == "text").strip()
+
+def prepare_question(state):
     """
-    Retrieves documents from the vector store.
+    Joins the text parts of the question once so later nodes don't rescan the messages.
 
     Args:
         state (dict): The current graph state.
 
     Returns:
-        dict: New state with documents.
+        dict: New state with text_question.
     """
-    print("---RETRIEVING DOCUMENTS---")
-    messages = state["question"] # Now it's a list of messages
-    
-    # Extract text content for retrieval
-    text_question = ""
-    for msg_part in messages:
-        if msg_part["type"] == "text":
-            text_question += msg_part["text"] + " "
-    
-    documents = retriever.invoke(text_question.strip())
-    return {"documents": documents, "question": messages} # Pass the full messages list back
+    return {"text_question": _join_text_parts(state["question"])}
+
+# Candidates taken from each retrieval channel, and the minimum vector
+# relevance score (0..1) a chunk needs. This replaces the LLM document grader.
+RETRIEVAL_CANDIDATES = 20
+RELEVANCE_THRESHOLD = 0.35
+# Reciprocal rank fusion constant and the number of fused chunks kept
+RRF_K = 60
+HYBRID_TOP_K = int(os.getenv("RAG_TOP_K", "6"))
+# Longest slice of any single chunk or web result that is put into a prompt
+CHUNK_CHAR_LIMIT = 1500
+
+_RETRIEVAL_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+def _reciprocal_rank_fusion(*ranked_lists):
+    """
+    Merges ranked document lists, scoring each document by sum(1 / (RRF_K + rank)).
+    """
+    scores = {}
+    documents = {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked, start=1):
+            # Chroma and the keyword index return separate objects for the same chunk
+            key = doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+            documents.setdefault(key, doc)
+    ranked_keys = sorted(scores, key=scores.get, reverse=True)
+    return [documents[key] for key in ranked_keys[:HYBRID_TOP_K]]
+
+def _documents_text(documents):
+    # Only the chunk text goes into prompts, never the Document metadata
+    return "\n\n".join(doc.page_content[:CHUNK_CHAR_LIMIT] for doc in documents)
+
+def _web_results_text(web_search_results):
+    # Tavily returns dicts with url and content; the content is what the LLM needs
+    return "\n\n".join(
+        (result.get("content", "") if isinstance(result, dict) else str(result))[:CHUNK_CHAR_LIMIT]
+        for result in web_search_results
+    )
+
+def _chroma_relevance_score(distance):
+    # The collection uses Chroma's default squared-L2 space; this is the
+    # score LangChain gives it for unit-length embeddings
+    return 1.0 - distance / math.sqrt(2)
+
+def _vector_search(components, query, embedding):
+    """
+    Returns (Document, relevance score) pairs, searching by the precomputed
+    embedding when there is one instead of embedding the query again.
+    """
+    if embedding is None:
+        embedding = components.embeddings.embed_query(query)
+    return [
+        (doc, components.relevance_score(distance))
+        for doc, distance in components.vectorstore.similarity_search_by_vector_with_relevance_scores(
+            embedding, k=RETRIEVAL_CANDIDATES
+        )
+    ]
 
-def grade_documents(state):
+def retrieve_documents(state):
     """
-    Grades the relevance of retrieved documents to the user question.
+    Retrieves documents by vector similarity (kept only if they clear
+    RELEVANCE_THRESHOLD) and by keyword match, and fuses the two rankings.
 
     Args:
         state (dict): The current graph state.
 
     Returns:
-        dict: New state with a decision ("continue" or "web_search").
+        dict: New state with documents and a decision ("continue" or "web_search").
     """
-    print("---CHECKING DOCUMENT RELEVANCE---")
-    messages = state["question"] # Now it's a list of messages
+    print("---RETRIEVING DOCUMENTS---")
+    components = _build_app()
+    query = state["text_question"]
+    vector_future = _RETRIEVAL_EXECUTOR.submit(
+        _vector_search, components, query, state.get("question_embedding")
+    )
+    keyword_future = _RETRIEVAL_EXECUTOR.submit(
+        components.keyword_index.keyword_search, query, k=RETRIEVAL_CANDIDATES
+    )
+    vector_hits = [doc for doc, score in vector_future.result() if score >= RELEVANCE_THRESHOLD]
+    documents = _reciprocal_rank_fusion(vector_hits, keyword_future.result())
 
-    # Extract text content for grading
-    text_question = ""
-    for msg_part in messages:
-        if msg_part["type"] == "text":
-            text_question += msg_part["text"] + " "
+    # Only write our own keys; web_search updates state in the same step
+    if documents:
+        print("---DECISION: DOCUMENTS ARE RELEVANT, CONTINUE---")
+        return {"documents": documents, "decision": "continue"}
+    print("---DECISION: NO RELEVANT DOCUMENTS, WEB SEARCH---")
+    return {"documents": documents, "decision": "web_search"}
 
-    documents = state["documents"]
+# Tavily results keyed by the normalized query, so repeated questions skip the network call
+TAVILY_CACHE_TTL = int(os.getenv("TAVILY_CACHE_TTL", "3600"))
+_tavily_cache = TTLCache(maxsize=512, ttl=TAVILY_CACHE_TTL)
+_tavily_cache_lock = threading.Lock()
 
-    # LLM call to grade documents
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", 'You are a grader assessing if a retrieved document is sufficient to answer a user\'s question. Grade it as "yes" if the document contains enough detailed information to provide a comprehensive answer. Otherwise, grade it as "no". Provide the binary score as a JSON with a single key "score".'),
-        ("user", "User question: {question}\n\nRetrieved document:\n\n{document_content}\n\nIs the document sufficient to answer the question?"),
-    ])
-    
-    grader_chain = prompt | llm | JsonOutputParser()
-    
-    # Grade each document
-    relevant_docs = []
-    for doc in documents:
-        result = grader_chain.invoke({"document_content": doc.page_content, "question": text_question.strip()})
-        grade = result.get("score", "no")
-        if grade.lower() == "yes":
-            relevant_docs.append(doc)
-    
-    if relevant_docs:
-        print("---DECISION: DOCUMENTS ARE RELEVANT, CONTINUE---")
-        return {"documents": relevant_docs, "question": messages, "decision": "continue"}
-    else:
-        print("---DECISION: NO RELEVANT DOCUMENTS, WEB SEARCH---")
-        return {"question": messages, "decision": "web_search"}
+def _cached_tavily_search(query):
+    """
+    Returns the Tavily results for query, from the TTL cache when possible.
+    Returns [] when Tavily is not configured.
+    """
+    tavily_tool = _build_app().tavily_tool
+    if tavily_tool is None:
+        return []
+    normalized = " ".join(query.lower().split())
+    key = hashlib.sha256(normalized.encode()).hexdigest()
+    with _tavily_cache_lock:
+        results = _tavily_cache.get(key)
+    if results is not None:
+        return results
+
+    results = tavily_tool.invoke({"query": normalized})
+    # On API errors TavilySearchResults returns the error text instead of
+    # raising; only cache real result lists
+    if isinstance(results, list):
+        with _tavily_cache_lock:
+            _tavily_cache[key] = results
+    return results
 
 def web_search(state):
     """
@@ -149,16 +289,9 @@ def web_search(state):
         dict: New state with web search results.
     """
     print("---WEB SEARCH---")
-    messages = state["question"] # Now it's a list of messages
-
-    # Extract text content for web search
-    text_question = ""
-    for msg_part in messages:
-        if msg_part["type"] == "text":
-            text_question += msg_part["text"] + " "
-
-    web_search_results = tavily_tool.invoke({"query": text_question.strip()})
-    return {"web_search_results": web_search_results, "question": messages}
+    web_search_results = _cached_tavily_search(state["text_question"])
+    # Only write our own key; retrieve_documents updates state in the same step
+    return {"web_search_results": web_search_results}
 
 def generate_answer(state):
     """
@@ -177,9 +310,9 @@ def generate_answer(state):
     
     context_text = ""
     if documents:
-        context_text += "Knowledge Base Documents:\n" + "\n\n".join([doc.page_content for doc in documents])
+        context_text += "Knowledge Base Documents:\n" + _documents_text(documents)
     if web_search_results:
-        context_text += "\n\nWeb Search Results:\n" + "\n\n".join([str(s) for s in web_search_results])
+        context_text += "\n\nWeb Search Results:\n" + _web_results_text(web_search_results)
 
     if not context_text:
         generation = "I can only help you with farmer related queries."
@@ -197,15 +330,25 @@ def generate_answer(state):
             )
         )
         
-        # Create a human message with the user's input (text and images)
-        human_message = HumanMessage(content=messages)
+        # Create a human message with the user's input (text and images).
+        # The image is only encoded here, for the LLM request
+        content = list(messages)
+        if state.get("image_path"):
+            with open(state["image_path"], "rb") as image:
+                image_data = pybase64.b64encode_as_string(image.read())
+            content.append({"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}})
+        human_message = HumanMessage(content=content)
         
         # Invoke the LLM with the full list of messages
         full_messages = [system_message, human_message]
-        generation = llm.invoke(full_messages).content
+        generation = _build_app().llm.invoke(full_messages).content
     
     return {"documents": documents, "web_search_results": web_search_results, "question": messages, "generation": generation}
 
+# How many times an ungrounded answer may send the question back through
+# transform_query before the fallback answer is returned
+MAX_QUERY_REWRITES = 2
+
 def grade_generation(state):
     """
     Grades the generated answer based on the retrieved documents. This is our 'Verifier'.
@@ -217,14 +360,6 @@ def grade_generation(state):
         dict: The original state, as this is a read-only check.
     """
     print("---CHECKING IF ANSWER IS GROUNDED IN DOCUMENTS---")
-    messages = state["question"] # Now it's a list of messages
-
-    # Extract text content for grading
-    text_question = ""
-    for msg_part in messages:
-        if msg_part["type"] == "text":
-            text_question += msg_part["text"] + " "
-
     documents = state["documents"]
     generation = state["generation"]
     web_search_results = state.get("web_search_results", [])
@@ -232,32 +367,25 @@ def grade_generation(state):
     # Combine all context for grading
     all_context = ""
     if documents:
-        all_context += "\n\n".join([doc.page_content for doc in documents])
+        all_context += _documents_text(documents)
     if web_search_results:
-        all_context += "\n\n".join([str(s) for s in web_search_results])
+        all_context += _web_results_text(web_search_results)
 
     if not all_context: # If no context was available, it cannot be grounded
         print("---DECISION: NO CONTEXT AVAILABLE, GENERATION NOT GROUNDED, FINISH---")
         return {"decision": "finish", "generation": "I can only help you with farmer related queries."}
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", 'You are a grader assessing whether an answer is grounded in / supported by a set of facts. Give a binary "yes" or "no" score to indicate whether the answer is grounded in the provided facts. Provide the binary score as a JSON with a single key "score".'),
-            ("user", "Retrieved facts:\n\n{facts}\n\nGenerated answer:\n{generation}\n\nAnswer the question: Is the generated answer grounded in the retrieved facts?"),
-        ]
-    )
-    
-    grader_chain = prompt | llm | JsonOutputParser()
-    
-    result = grader_chain.invoke({"facts": all_context, "generation": generation})
+    result = _build_app().grade_generation_chain.invoke({"facts": all_context, "generation": generation})
     grade = result.get("score", "no")
     
     if grade.lower() == "yes":
         print("---DECISION: GENERATION IS GROUNDED, FINISH---")
         return {"decision": "finish"}
-    else:
-        print("---DECISION: GENERATION NOT GROUNDED, FINISH---")
-        return {"decision": "finish", "generation": "I can only help you with farmer related queries."}
+    if state.get("iteration", 0) < MAX_QUERY_REWRITES:
+        print("---DECISION: GENERATION NOT GROUNDED, RE-TRY---")
+        return {"decision": "re-try"}
+    print("---DECISION: GENERATION NOT GROUNDED, MAX ITERATIONS REACHED, FINISH---")
+    return {"decision": "finish", "generation": "I can only help you with farmer related queries."}
 
 def transform_query(state):
     """
@@ -267,38 +395,22 @@ def transform_query(state):
         state (dict): The current graph state.
 
     Returns:
-        dict: New state with a transformed query.
+        dict: New state with a transformed query and its text_question.
     """
     print("---TRANSFORMING QUERY---")
     messages = state["question"] # Now it's a list of messages
 
-    # Extract text content for query transformation
-    text_question = ""
-    for msg_part in messages:
-        if msg_part["type"] == "text":
-            text_question += msg_part["text"] + " "
-
     documents = state["documents"]
     web_search_results = state.get("web_search_results", [])
     iteration = state.get("iteration", 0) + 1
 
-    if iteration > 3:
-        print("---MAX ITERATIONS REACHED, FINISHING---")
-        return {"question": messages} # Return the original messages
-
     context = ""
     if documents:
-        context += "Knowledge Base Documents:\n" + "\n\n".join([doc.page_content for doc in documents])
+        context += "Knowledge Base Documents:\n" + _documents_text(documents)
     if web_search_results:
-        context += "\n\n".join([str(s) for s in web_search_results])
+        context += _web_results_text(web_search_results)
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a query transformation expert. Your task is to rewrite the user's question to be more specific and easier to answer, based on the previously retrieved information (documents and/or web search results). Do not generate an answer, only a better question."),
-        ("user", "Original question: {question}\n\nPreviously retrieved information (may be irrelevant):\n{context}\n\nRewrite the question to improve the chances of retrieving relevant information."),
-    ])
-    
-    transform_chain = prompt | llm | StrOutputParser()
-    better_question_text = transform_chain.invoke({"question": text_question.strip(), "context": context})
+    better_question_text = _build_app().transform_query_chain.invoke({"question": state["text_question"], "context": context})
     
     # Reconstruct the messages with the transformed text question
     transformed_messages = []
@@ -308,26 +420,32 @@ def transform_query(state):
         else:
             transformed_messages.append(msg_part) # Keep image parts as they are
             
-    return {"question": transformed_messages, "iteration": iteration}
+    # The rewritten question has to be embedded afresh
+    return {
+        "question": transformed_messages,
+        "text_question": _join_text_parts(transformed_messages),
+        "question_embedding": None,
+        "iteration": iteration,
+    }
 
 # --- 4. Build the Graph ---
 
 workflow = StateGraph(GraphState)
 
 # Define the nodes
+workflow.add_node("prepare_question", prepare_question)
 workflow.add_node("retrieve_documents", retrieve_documents)
-# grade_documents node is removed
 workflow.add_node("web_search", web_search)
 workflow.add_node("generate_answer", generate_answer)
 workflow.add_node("grade_generation", grade_generation)
 workflow.add_node("transform_query", transform_query)
 
-# Set the entrypoint
-workflow.set_entry_point("retrieve_documents")
-
-# Add edges
-workflow.add_edge("retrieve_documents", "web_search")
-workflow.add_edge("web_search", "generate_answer")
+# Retrieval and web search are independent, so fan out to both in parallel
+# and join before generation; the pre-generation wait is max(), not sum()
+workflow.add_edge(START, "prepare_question")
+workflow.add_edge("prepare_question", "retrieve_documents")
+workflow.add_edge("prepare_question", "web_search")
+workflow.add_edge(["retrieve_documents", "web_search"], "generate_answer")
 workflow.add_edge("generate_answer", "grade_generation")
 
 # Add conditional edges for generation grading
@@ -340,9 +458,9 @@ workflow.add_conditional_edges(
     },
 )
 workflow.add_edge("transform_query", "retrieve_documents")
+workflow.add_edge("transform_query", "web_search")
 
-# Compile the graph
-app = workflow.compile()
+# The graph is compiled lazily in _build_app()
 
 # --- 5. Define the main pipeline function ---
 
@@ -350,7 +468,7 @@ def get_rag_pipeline():
     """
     Returns the compiled LangGraph agent.
     """
-    return app
+    return _build_app().app
 
 def perform_tavily_search(query: str) -> List[Dict]:
     """
@@ -360,19 +478,17 @@ def perform_tavily_search(query: str) -> List[Dict]:
         return []
     print(f"---PERFORMING TAVILY SEARCH FOR: {query}---")
     try:
-        results = tavily_tool.invoke({"query": query})
+        results = _cached_tavily_search(query)
         return results
     except Exception as e:
         print(f"Error during Tavily search for query '{query}': {e}")
         return []
 
-from IPython.display import Image, display
-
 # Example usage (for testing purposes)
 if __name__ == "__main__":
     # Generate and save the architecture diagram
     try:
-        img_data = app.get_graph().draw_mermaid_png()
+        img_data = get_rag_pipeline().get_graph().draw_mermaid_png()
         with open("architecture.png", "wb") as f:
             f.write(img_data)
         print("Architecture diagram saved as architecture.png")
@@ -381,7 +497,7 @@ if __name__ == "__main__":
         print("Please ensure you have the 'pygraphviz' or 'pydot' package installed for graph visualization.")
 
     # Ensure you have a chroma_db directory with ingested data
-    # Run: python smart_farming_recommender/rag_core/data_ingest.py first
+    # Run: python -m rag_core.data_ingest (from smart_farming_recommender/) first
     
     # pipeline = get_rag_pipeline()
     
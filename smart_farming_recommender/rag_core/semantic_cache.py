@@ -0,0 +1,121 @@
+import logging
+import os
+import threading
+import time
+import uuid
+import numpy as np
+import redis
+from django.conf import settings
+from redis.commands.search.query import Query
+from .embeddings import EMBEDDING_DIMENSIONS, get_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Cosine distance below which two questions are treated as the same question
+DISTANCE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.15"))
+# Cached answers expire from Redis after this long
+TTL_SECONDS = int(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 60 * 60)))
+
+# Namespaced so the entries and index don't mix with the Celery broker's keys,
+# which share database 0 (the only one Redis vector search indexes) unless
+# SEMANTIC_CACHE_REDIS_URL points at a separate Redis
+INDEX_NAME = "rag_core:semantic_cache:index"
+KEY_PREFIX = "rag_core:semantic_cache:entry:"
+# How long a process waits before retrying after Redis could not be set up
+RETRY_SECONDS = 60
+
+class SemanticCache:
+    """
+    Stores pipeline answers keyed by the embedding of the question, so that
+    near-duplicate questions can be answered without running the RAG graph.
+
+    Entries are Redis hashes searched through a vector index, so every web
+    worker process shares one cache and Redis expires old answers itself.
+    """
+
+    def __init__(self, client, threshold=DISTANCE_THRESHOLD, ttl=TTL_SECONDS):
+        self.client = client
+        self.threshold = threshold
+        self.ttl = ttl
+        self.index = client.ft(INDEX_NAME)
+        try:
+            client.execute_command(
+                "FT.CREATE", INDEX_NAME, "ON", "HASH", "PREFIX", 1, KEY_PREFIX,
+                "SCHEMA", "embedding", "VECTOR", "HNSW", 6,
+                "TYPE", "FLOAT32", "DIM", EMBEDDING_DIMENSIONS, "DISTANCE_METRIC", "COSINE",
+            )
+        except redis.ResponseError as e:
+            # Another worker process created it first
+            if "already exists" not in str(e).lower():
+                raise
+
+    @staticmethod
+    def _vector_bytes(question, embedding):
+        if embedding is None:
+            embedding = get_embeddings().embed_query(question)
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+
+    def lookup(self, question, embedding=None):
+        """
+        Returns the cached answer for the closest stored question, or None.
+        Pass the question's embedding when the caller already has it.
+        """
+        query = (
+            Query("*=>[KNN 1 @embedding $vector AS distance]")
+            .return_fields("answer", "distance")
+            .sort_by("distance")
+            .dialect(2)
+        )
+        try:
+            results = self.index.search(query, query_params={"vector": self._vector_bytes(question, embedding)})
+        except redis.RedisError as e:
+            # A cache outage only costs a pipeline run
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None
+        if not results.docs:
+            return None
+        doc = results.docs[0]
+        if float(doc.distance) >= self.threshold:
+            return None
+        return doc.answer
+
+    def add(self, question, answer, embedding=None):
+        """
+        Stores answer for question. Pass the question's embedding when the
+        caller already has it; otherwise it is embedded via the cached query path.
+        """
+        key = f"{KEY_PREFIX}{uuid.uuid4().hex}"
+        vector = self._vector_bytes(question, embedding)
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.hset(key, mapping={"question": question, "answer": answer, "embedding": vector})
+                pipe.expire(key, self.ttl)
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Semantic cache write failed: %s", e)
+
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+_retry_at = 0.0
+
+def get_semantic_cache():
+    """
+    Returns the process-wide semantic cache, or None while Redis can't be
+    reached or has no vector search (it needs Redis 8+ or Redis Stack).
+
+    Only a working cache is kept; after a failure the next call at least
+    RETRY_SECONDS later tries again.
+    """
+    global _semantic_cache, _retry_at
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None and time.monotonic() >= _retry_at:
+                client = redis.Redis.from_url(
+                    settings.SEMANTIC_CACHE_REDIS_URL, socket_connect_timeout=2, socket_timeout=2
+                )
+                try:
+                    _semantic_cache = SemanticCache(client)
+                except redis.RedisError as e:
+                    _retry_at = time.monotonic() + RETRY_SECONDS
+                    logger.warning("Semantic cache unavailable, retrying in %ds: %s", RETRY_SECONDS, e)
+    return _semantic_cache
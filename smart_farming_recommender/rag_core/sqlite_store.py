@@ -0,0 +1,127 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from langchain_core.documents import Document
+from .embeddings import EMBEDDING_DIMENSIONS, get_embeddings
+
+# Set RAG_USE_SQLITE_VEC=true to retrieve from the sqlite-vec index instead of Chroma
+USE_SQLITE_VEC = os.getenv("RAG_USE_SQLITE_VEC", "").lower() in ("1", "true", "yes")
+
+def relevance_score(distance):
+    """
+    Converts a vec_chunks cosine distance into the relevance score Chroma gives
+    the same chunk. The Chroma collection uses its default squared-L2 space,
+    scored as 1 - d / sqrt(2); for unit-length embeddings squared L2 is twice
+    the cosine distance, so RELEVANCE_THRESHOLD means the same on both stores.
+    """
+    return 1.0 - 2.0 * distance / math.sqrt(2)
+
+def default_store_path():
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(app_dir, 'chroma_db', 'vec_chunks.sqlite3')
+
+class SqliteVecStore:
+    """
+    Knowledge-base chunks stored in SQLite, with their embeddings in a
+    sqlite-vec vec0 table for kNN search.
+
+    Exposes the subset of the Chroma API that ingestion and retrieval use.
+    """
+
+    def __init__(self, path, embeddings):
+        # Imported here so deployments that keep Chroma don't need the extension
+        import sqlite_vec
+
+        self.embeddings = embeddings
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by the graph's worker threads, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.enable_load_extension(True)
+        sqlite_vec.load(self._conn)
+        self._conn.enable_load_extension(False)
+        self._serialize = sqlite_vec.serialize_float32
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                content TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_source ON chunks (source);
+            CREATE VIRTUAL TABLE IF NOT EXISTS vec_chunks USING vec0(
+                embedding float[{EMBEDDING_DIMENSIONS}] distance_metric=cosine
+            );
+        """)
+
+    def add_documents(self, documents):
+        self.add_embedded_documents(documents, self.embeddings.embed_documents([doc.page_content for doc in documents]))
+
+    def add_embedded_documents(self, documents, vectors):
+        """
+        Adds documents whose embeddings were already computed, e.g. by Chroma.
+        """
+        with self._lock, self._conn:
+            for doc, vector in zip(documents, vectors):
+                cursor = self._conn.execute(
+                    'INSERT INTO chunks (source, content, metadata) VALUES (?, ?, ?)',
+                    (doc.metadata.get('source', ''), doc.page_content, json.dumps(doc.metadata)),
+                )
+                self._conn.execute(
+                    'INSERT INTO vec_chunks (rowid, embedding) VALUES (?, ?)',
+                    (cursor.lastrowid, self._serialize(vector)),
+                )
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM chunks LIMIT 1').fetchone() is None
+
+    def delete_sources(self, sources):
+        """
+        Removes every chunk that was split from one of the given source files.
+        """
+        with self._lock, self._conn:
+            for source in sources:
+                ids = [(row[0],) for row in self._conn.execute('SELECT id FROM chunks WHERE source = ?', (source,))]
+                self._conn.executemany('DELETE FROM vec_chunks WHERE rowid = ?', ids)
+                self._conn.executemany('DELETE FROM chunks WHERE id = ?', ids)
+
+    def similarity_search_with_relevance_scores(self, query, k=4):
+        """
+        Returns the k nearest chunks as (Document, score) pairs, scored by
+        relevance_score so they compare directly with Chroma's.
+        """
+        return [
+            (doc, relevance_score(distance))
+            for doc, distance in self.similarity_search_by_vector_with_relevance_scores(self.embeddings.embed_query(query), k)
+        ]
+
+    def similarity_search_by_vector_with_relevance_scores(self, embedding, k=4):
+        """
+        Returns the k chunks nearest to embedding as (Document, cosine distance)
+        pairs, like Chroma's method of the same name.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT chunks.content, chunks.metadata, knn.distance
+                FROM (
+                    SELECT rowid, distance FROM vec_chunks
+                    WHERE embedding MATCH ? AND k = ?
+                ) AS knn
+                JOIN chunks ON chunks.id = knn.rowid
+                ORDER BY knn.distance
+                """,
+                (self._serialize(embedding), k),
+            ).fetchall()
+        return [
+            (Document(page_content=content, metadata=json.loads(metadata)), distance)
+            for content, metadata, distance in rows
+        ]
+
+@lru_cache(maxsize=1)
+def get_sqlite_store(path=None):
+    return SqliteVecStore(path or default_store_path(), get_embeddings())
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from celery import shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from .models import ChatMessage, Report
+from .rag_pipeline import get_rag_pipeline
+
+CHAT_UPLOADS_DIR = 'chat_uploads'
+
+@shared_task(ignore_result=True)
+def save_chat_messages(session_id, messages):
+    """
+    Persists one chat exchange with a single INSERT.
+
+    messages is a list of [text, is_user_message] pairs in display order.
+    """
+    ChatMessage.objects.bulk_create([
+        ChatMessage(session_id=session_id, message=text, is_user_message=is_user_message)
+        for text, is_user_message in messages
+    ])
+
+@shared_task(ignore_result=True)
+def purge_chat_uploads():
+    """
+    Deletes chat images older than CHAT_UPLOAD_MAX_AGE_HOURS; they are only
+    needed while the question that uploaded them is being answered.
+    """
+    if not default_storage.exists(CHAT_UPLOADS_DIR):
+        return
+    cutoff = timezone.now() - timedelta(hours=settings.CHAT_UPLOAD_MAX_AGE_HOURS)
+    _, filenames = default_storage.listdir(CHAT_UPLOADS_DIR)
+    for filename in filenames:
+        name = f'{CHAT_UPLOADS_DIR}/{filename}'
+        if default_storage.get_modified_time(name) < cutoff:
+            default_storage.delete(name)
+
+def report_data(report):
+    """
+    The report fields the planning page needs to render and list a report.
+    """
+    return {
+        'id': report.id,
+        'title': report.title,
+        'content': report.content,
+        'created_at': report.created_at.strftime('%b %d, %Y, %I:%M %p')
+    }
+
+@shared_task(bind=True)
+def generate_report_task(self, user_id, user_report_query, report_query):
+    """
+    Runs the RAG pipeline for a report request and saves the result.
+
+    Returns the new Report's id, which ReportStatusView reads back from the
+    task result.
+    """
+    # The graph takes the question as a list of message parts, like RAGChatView sends
+    final_state = get_rag_pipeline().invoke({"question": [{"type": "text", "text": report_query}]})
+    if not final_state or "generation" not in final_state:
+        raise RuntimeError('Could not generate a detailed report.')
+
+    # Generate a title for the report
+    title = user_report_query if user_report_query else "Farming Report"
+    title = (title[:197] + '...') if len(title) > 200 else title
+
+    report = Report.objects.create(user_id=user_id, title=title, content=final_state["generation"])
+    return report.id
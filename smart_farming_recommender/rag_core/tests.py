@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from . import rag_pipeline
+from .models import Report
+from .tasks import generate_report_task
+
+class GenerateReportTaskTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='farmer@example.com', password='secret')
+
+    @mock.patch('rag_core.tasks.get_rag_pipeline')
+    def test_saves_report_from_pipeline_generation(self, get_rag_pipeline):
+        pipeline = get_rag_pipeline.return_value
+        pipeline.invoke.return_value = {"generation": "## Rice plan"}
+
+        report_id = generate_report_task.apply(args=(self.user.id, 'rice in kharif', 'full query')).get()
+
+        pipeline.invoke.assert_called_once_with({"question": [{"type": "text", "text": "full query"}]})
+        report = Report.objects.get(id=report_id)
+        self.assertEqual(report.user, self.user)
+        self.assertEqual(report.title, 'rice in kharif')
+        self.assertEqual(report.content, '## Rice plan')
+
+    @mock.patch('rag_core.tasks.get_rag_pipeline')
+    def test_raises_when_pipeline_has_no_generation(self, get_rag_pipeline):
+        get_rag_pipeline.return_value.invoke.return_value = {}
+
+        result = generate_report_task.apply(args=(self.user.id, '', 'full query'))
+
+        self.assertTrue(result.failed())
+        self.assertFalse(Report.objects.exists())
+
+class CachedTavilySearchTests(SimpleTestCase):
+    def setUp(self):
+        rag_pipeline._tavily_cache.clear()
+        self.addCleanup(rag_pipeline._tavily_cache.clear)
+        self.tavily_tool = mock.Mock()
+        patcher = mock.patch.object(rag_pipeline, '_build_app', return_value=SimpleNamespace(tavily_tool=self.tavily_tool))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_caches_results(self):
+        self.tavily_tool.invoke.return_value = [{"url": "https://example.com", "content": "Rice blast"}]
+
+        first = rag_pipeline._cached_tavily_search("Rice  Blast")
+        second = rag_pipeline._cached_tavily_search("rice blast")
+
+        self.assertEqual(first, second)
+        self.tavily_tool.invoke.assert_called_once_with({"query": "rice blast"})
+
+    def test_does_not_cache_errors(self):
+        # TavilySearchResults reports API failures as a string instead of raising
+        self.tavily_tool.invoke.return_value = "HTTPError('502 Server Error')"
+
+        rag_pipeline._cached_tavily_search("rice blast")
+        rag_pipeline._cached_tavily_search("rice blast")
+
+        self.assertEqual(self.tavily_tool.invoke.call_count, 2)
+        self.assertEqual(len(rag_pipeline._tavily_cache), 0)
@@ -6,7 +6,10 @@ from .views import (
     planning_page, 
     GenerateReportView,
     ChatHistoryView,
-    ReportDetailView
+    ReportDetailView,
+    ReportStatusView,
+    ReportListView,
+    ChatSessionListView
 )
 
 urlpatterns = [
@@ -17,4 +20,7 @@ urlpatterns = [
     path('api/generate-report/', GenerateReportView.as_view(), name='generate_report'),
     path('api/chat_history/<int:session_id>/', ChatHistoryView.as_view(), name='chat_history_api'),
     path('api/report/<int:report_id>/', ReportDetailView.as_view(), name='report_detail_api'),
+    path('api/report-status/<str:task_id>/', ReportStatusView.as_view(), name='report_status_api'),
+    path('api/reports/', ReportListView.as_view(), name='report_list_api'),
+    path('api/chat_sessions/', ChatSessionListView.as_view(), name='chat_session_list_api'),
 ]
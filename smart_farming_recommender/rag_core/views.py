@@ -1,36 +1,166 @@
 from .models import Report, ChatSession, ChatMessage
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, serializers
-from .rag_pipeline import get_rag_pipeline, perform_tavily_search # Import perform_tavily_search
+from .rag_pipeline import get_rag_pipeline
+from .semantic_cache import get_semantic_cache
+from .embeddings import get_embeddings
+from .tasks import CHAT_UPLOADS_DIR, generate_report_task, report_data, save_chat_messages
+from celery.result import AsyncResult
+from .image_ops import _autocontrast, _preprocess_rgb
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Max
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from rest_framework.permissions import IsAuthenticated
-import tempfile
-import pytesseract
-import base64
-from PIL import Image
-import io
-import re # Import regex module
+import os
+import logging
+import uuid
+import threading
+# Tesseract's OpenMP threads would oversubscribe the OCR pool; parallelism
+# comes from running one single-threaded engine per pool thread instead.
+# Must be set before tesseract is loaded.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+import numpy as np
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_ANSWER = "I can only help you with farmer related queries."
+
+# How long serialized report and chat history responses stay in the cache
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+REPORT_INSTRUCTIONS = (
+    "The report should cover the entire process from cultivation to harvesting, "
+    "including optimal crop selection, detailed cultivation practices, pest and disease management, "
+    "irrigation strategies, fertilization plans, estimated costs, expected yields, "
+    "and current market rates for the produce. Provide a comprehensive and actionable plan."
+)
+
+# Shared pool for OCR; PIL and tesseract release the GIL while decoding.
+# Concurrent uploads from every request queue onto the same warm engines.
+_OCR_POOL = ThreadPoolExecutor(max_workers=int(os.getenv('OCR_POOL_WORKERS', '4')))
+
+# One warm tesseract engine per thread; the C++ API is not thread-safe, and
+# per-thread instances avoid both a lock and reloading tessdata per image
+_tess_local = threading.local()
+
+def _get_tess_api():
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        # Imported here so workers that never OCR don't load libtesseract
+        from tesserocr import PSM, PyTessBaseAPI
+        # Uploads are photos of labels and documents: treat each as a single
+        # block of text and skip tesseract's page layout analysis
+        api = _tess_local.api = PyTessBaseAPI(lang='eng', psm=PSM.SINGLE_BLOCK)
+    return api
 
 def process_image_to_text(image_file):
     """
-    Uses pytesseract to perform OCR on an image file and extract text.
+    Uses tesseract (in-process, via tesserocr) to perform OCR on an image file and extract text.
     """
+    from PIL import Image
+
     try:
-        # Ensure the file pointer is at the beginning
-        image_file.seek(0)
-        img = Image.open(image_file)
-        # Use pytesseract to do OCR on the image
-        text = pytesseract.image_to_string(img)
+        # Large uploads are already spooled to disk by Django; decode from there
+        if hasattr(image_file, 'temporary_file_path'):
+            img = Image.open(image_file.temporary_file_path())
+        else:
+            img = Image.open(image_file)
+        # Grayscale and contrast-stretch in compiled kernels rather than per-pixel Python
+        gray = np.ascontiguousarray(_autocontrast(_preprocess_rgb(np.asarray(img.convert('RGB')))))
+        height, width = gray.shape
+        api = _get_tess_api()
+        # Hand tesseract the raw 8-bit buffer; SetImage(PIL) would re-encode
+        # the image for leptonica to decode again
+        api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+        text = api.GetUTF8Text()
         if text.strip():
             return f"The user provided an image containing the following text: {text}"
         else:
             return "User provided an image, but no text could be extracted."
     except Exception as e:
-        print(f"Error processing image with pytesseract: {e}")
+        logger.exception("Error processing image with tesseract: %s", e)
         return "User provided an image, but there was an error processing it."
 
+def _wants_event_stream(request):
+    """
+    Clients opt in to token streaming with "Accept: text/event-stream, application/json";
+    error responses are still rendered as JSON.
+    """
+    return 'text/event-stream' in request.META.get('HTTP_ACCEPT', '')
+
+def _sse(payload):
+    return f"data: {json.dumps(payload)}\n\n"
+
+def _event_stream_response(events):
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no' # Stop nginx from buffering the stream
+    return response
+
+async def _stream_pipeline(inputs):
+    """
+    Runs the RAG pipeline, yielding ("token", text) for every chunk the LLM
+    produces in generate_answer and finally ("state", final_state). A
+    ("reset", None) is yielded when a retry starts a new answer.
+
+    The grader may still replace the streamed answer, so clients must render
+    the final state's generation once the stream ends.
+    """
+    final_state = None
+    answer_step = None
+    rag_pipeline = await sync_to_async(get_rag_pipeline, thread_sensitive=False)()
+    async for mode, chunk in rag_pipeline.astream(inputs, stream_mode=["messages", "values"]):
+        if mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") == "generate_answer" and isinstance(message.content, str) and message.content:
+                step = metadata.get("langgraph_step")
+                if answer_step is not None and step != answer_step:
+                    yield "reset", None
+                answer_step = step
+                yield "token", message.content
+        else:
+            final_state = chunk
+    yield "state", final_state
+
+def _embed_question(question):
+    return get_embeddings().embed_query(question.strip())
+
+async def _cache_lookup(semantic_cache, question, embedding):
+    if semantic_cache is None:
+        return None
+    return await sync_to_async(semantic_cache.lookup, thread_sensitive=False)(question, embedding)
+
+async def _cache_add(semantic_cache, question, answer, embedding):
+    if semantic_cache is not None and answer != FALLBACK_ANSWER:
+        await sync_to_async(semantic_cache.add, thread_sensitive=False)(question, answer, embedding)
+
+# Sidebar lists show this many sessions/reports, newest first; older ones are
+# fetched from the list APIs with ?before_id=<id>
+HISTORY_LIST_PAGE_SIZE = 50
+
+def _newest_first_page(queryset, before_id=None, page_size=HISTORY_LIST_PAGE_SIZE):
+    """
+    Returns (items, next_before_id) for keyset pagination on the primary key.
+    next_before_id is None on the last page.
+    """
+    queryset = queryset.order_by('-id')
+    if before_id:
+        queryset = queryset.filter(id__lt=before_id)
+    items = list(queryset[:page_size + 1])
+    if len(items) > page_size:
+        return items[:page_size], items[page_size - 1].id
+    return items, None
+
 @login_required
 def ai_dashboard(request):
     return render(request, 'rag_core/ai_dashboard.html')
@@ -38,16 +168,20 @@ def ai_dashboard(request):
 @login_required
 def planning_page(request):
     # Fetch all reports for the current user, ordered by creation date
-    user_reports = Report.objects.filter(user=request.user)
+    # The page only lists titles; the report content is fetched on click
+    user_reports, next_before_id = _newest_first_page(
+        Report.objects.filter(user=request.user).only('id', 'title', 'created_at')
+    )
     context = {
-        'reports': user_reports
+        'reports': user_reports,
+        'next_before_id': next_before_id,
     }
     return render(request, 'rag_core/planning.html', context)
 
-class RAGChatView(APIView):
+class RAGChatView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         user_question = request.data.get('question', '')
         image_files = request.FILES.getlist('images')
         session_id = request.data.get('session_id')
@@ -63,83 +197,175 @@ class RAGChatView(APIView):
         image_path = None
         if image_files:
             image_file = image_files[0] # For now, only handle one image
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_image:
-                for chunk in image_file.chunks():
-                    temp_image.write(chunk)
-                image_path = temp_image.name
-            
-            # Add image to message parts for display
-            image_file.seek(0) # Reset file pointer to the beginning
-            image_data = base64.b64encode(image_file.read()).decode('utf-8')
-            message_parts.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{image_data}"
-                }
-            })
-
-        if not message_parts:
+            # The pipeline gets the path; generate_answer attaches the image to
+            # the LLM call itself, so no base64 copy travels through graph state.
+            # purge_chat_uploads removes the file once it is old enough
+            image_name = await sync_to_async(default_storage.save)(
+                f'{CHAT_UPLOADS_DIR}/{uuid.uuid4().hex}.png', image_file
+            )
+            image_path = default_storage.path(image_name)
+
+        if not message_parts and not image_path:
             return Response({'error': 'No valid question or image content to process.'}, status=status.HTTP_400_BAD_REQUEST)
 
         # --- Session Management ---
         session = None
         title = None
+        session_creation = None
         if session_id:
-            session = get_object_or_404(ChatSession, id=session_id, user=request.user)
-        else:
-            # Create a new session
-            title = (user_question[:150] + '...') if len(user_question) > 150 else user_question
-            session = ChatSession.objects.create(user=request.user, title=title)
-        
-        # Save user message
-        # We need to decide how to save the multimodal message
-        # For now, we'll just save the text part
-        if user_question:
-            ChatMessage.objects.create(session=session, message=user_question, is_user_message=True)
+            try:
+                session = await ChatSession.objects.aget(id=session_id, user=request.user)
+            except ChatSession.DoesNotExist:
+                raise Http404
 
-        # --- RAG Pipeline Execution ---
         try:
-            rag_pipeline = get_rag_pipeline()
-            inputs = {"question": message_parts, "image_path": image_path}
-            final_state = rag_pipeline.invoke(inputs)
-            
-            if final_state is None:
-                return Response({'error': 'The RAG pipeline did not produce a final result.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            answer = final_state.get("generation", "I can only help you with farmer related queries.")
-            
-            # Save AI message
-            ChatMessage.objects.create(session=session, message=answer, is_user_message=False)
-
-            response_data = {
-                'answer': answer,
-                'session_id': session.id,
-            }
-            if title: # Include title and session data if it's a new session
-                response_data['new_session'] = {
-                    'id': session.id,
-                    'title': session.title
-                }
+            if session is None:
+                # Create a new session, overlapping the insert with the embedding below.
+                # It is created before (and independently of) the pipeline, so a failed
+                # answer still leaves the session for the client to retry into
+                title = (user_question[:150] + '...') if len(user_question) > 150 else user_question
+                session_creation = asyncio.ensure_future(ChatSession.objects.acreate(user=request.user, title=title))
+
+            # --- RAG Pipeline Execution ---
+            # Text-only questions may be answered from the semantic cache
+            semantic_cache = None
+            if user_question and not image_files:
+                semantic_cache = await sync_to_async(get_semantic_cache, thread_sensitive=False)()
+            # Embed the question once for both the semantic cache and retrieval
+            question_embedding = None
+            if user_question.strip():
+                question_embedding = await sync_to_async(_embed_question, thread_sensitive=False)(user_question)
+            inputs = {"question": message_parts, "image_path": image_path, "question_embedding": question_embedding}
+            if session_creation is not None:
+                session = await session_creation
+        except BaseException:
+            if session_creation is not None:
+                await self._discard_session(session_creation)
+            raise
+
+        if _wants_event_stream(request):
+            return _event_stream_response(self._answer_events(inputs, semantic_cache, user_question, session, title))
+
+        answer = None
+        try:
+            answer = await _cache_lookup(semantic_cache, user_question, question_embedding)
 
-            return Response(response_data, status=status.HTTP_200_OK)
+            if answer is None:
+                rag_pipeline = await sync_to_async(get_rag_pipeline, thread_sensitive=False)()
+                final_state = await rag_pipeline.ainvoke(inputs)
+
+                if final_state is None:
+                    return Response({'error': 'The RAG pipeline did not produce a final result.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+                answer = final_state.get("generation", FALLBACK_ANSWER)
+                await _cache_add(semantic_cache, user_question, answer, question_embedding)
+
+            return Response(self._answer_payload(session, title, answer), status=status.HTTP_200_OK)
         except Exception as e:
-            print(f"Error in RAG pipeline: {e}")
+            logger.exception("Error in RAG pipeline: %s", e)
+            answer = None
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        finally:
+            await self._queue_messages(session, user_question, answer)
+
+    async def _discard_session(self, session_creation):
+        """
+        Deletes a session whose creation was started for a request that failed
+        before the pipeline ran; the client never learns its id. The insert
+        can't be cancelled once its thread has started, so wait for it.
+        """
+        try:
+            session = await session_creation
+        except Exception:
+            return # The insert itself failed; nothing to clean up
+        await session.adelete()
+
+    async def _queue_messages(self, session, user_question, answer):
+        """
+        Hands the exchange to a Celery worker, which saves it with one
+        bulk_create. Nothing is saved if no answer was produced, so failed
+        requests don't leave unanswered questions in the session.
+        """
+        if answer is None:
+            return
+        # We need to decide how to save the multimodal message
+        # For now, we'll just save the text part
+        messages = []
+        if user_question:
+            messages.append((user_question, True))
+        messages.append((answer, False))
+        await sync_to_async(save_chat_messages.delay)(session.id, messages)
+
+    def _answer_payload(self, session, title, answer):
+        """
+        Returns the response payload for an answer.
+        """
+        response_data = {
+            'answer': answer,
+            'session_id': session.id,
+        }
+        if title: # Include title and session data if it's a new session
+            response_data['new_session'] = {
+                'id': session.id,
+                'title': session.title
+            }
+        return response_data
+
+    async def _answer_events(self, inputs, semantic_cache, user_question, session, title):
+        """
+        Server-sent events for the streaming path: a "token" event per LLM
+        chunk, then a "done" event carrying the same payload as the JSON path.
+        """
+        answer = None
+        try:
+            answer = await _cache_lookup(semantic_cache, user_question, inputs["question_embedding"])
+
+            if answer is None:
+                final_state = None
+                async for kind, value in _stream_pipeline(inputs):
+                    if kind == "token":
+                        yield _sse({'type': 'token', 'text': value})
+                    elif kind == "reset":
+                        yield _sse({'type': 'reset'})
+                    else:
+                        final_state = value
+
+                if final_state is None:
+                    yield _sse({'type': 'error', 'error': 'The RAG pipeline did not produce a final result.'})
+                    return
+
+                answer = final_state.get("generation", FALLBACK_ANSWER)
+                await _cache_add(semantic_cache, user_question, answer, inputs["question_embedding"])
+
+            yield _sse({'type': 'done', **self._answer_payload(session, title, answer)})
+        except Exception as e:
+            logger.exception("Error in RAG pipeline: %s", e)
+            answer = None
+            yield _sse({'type': 'error', 'error': str(e)})
+        finally:
+            await self._queue_messages(session, user_question, answer)
 
 @login_required
 def chat_page(request):
     # Fetch all chat sessions for the current user
-    user_sessions = ChatSession.objects.filter(user=request.user)
+    user_sessions, next_before_id = _newest_first_page(
+        ChatSession.objects.filter(user=request.user).only('id', 'title', 'created_at')
+    )
     context = {
-        'sessions': user_sessions
+        'sessions': user_sessions,
+        'next_before_id': next_before_id,
     }
     return render(request, 'rag_core/chat.html', context)
 
-class GenerateReportView(APIView):
+class GenerateReportView(AsyncAPIView):
+    """
+    Validates the report form, OCRs any images and queues report generation.
+    Responds 202 with the task id to poll at ReportStatusView.
+    """
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
-        print("\n--- [GenerateReportView] Received POST request ---")
+    async def post(self, request):
+        logger.debug("[GenerateReportView] Received POST request")
         user_report_query = request.data.get('user_report_query', '').strip()
         soil_type = request.data.get('soil_type', '').strip()
         budget = request.data.get('budget', '').strip()
@@ -147,108 +373,81 @@ class GenerateReportView(APIView):
         land_area = request.data.get('land_area', '').strip()
         climate_zone = request.data.get('climate_zone', '').strip()
         additional_notes = request.data.get('additional_notes', '').strip()
-        image_file = request.FILES.get('image') # Get uploaded image file
+        image_files = request.FILES.getlist('image') # Get uploaded image file(s)
+
+        has_user_input = bool(
+            user_report_query or soil_type or budget or crop_preference
+            or land_area or climate_zone or additional_notes or image_files
+        )
+        if not has_user_input:
+            logger.debug("[GenerateReportView] No information provided to generate a report.")
+            return Response({'error': 'Please provide some information or a query to generate a report.'}, status=status.HTTP_400_BAD_REQUEST)
 
         image_description = ""
-        if image_file:
-            print("[GenerateReportView] Processing uploaded image.")
-            image_description = process_image_to_text(image_file)
-            if "error" in image_description.lower(): # Check if image processing failed
-                print(f"[GenerateReportView] Image processing failed: {image_description}")
-                return Response({'error': f"Image processing failed: {image_description}"}, status=status.HTTP_400_BAD_REQUEST)
+        if image_files:
+            logger.debug("[GenerateReportView] Processing %d uploaded image(s).", len(image_files))
+            # OCR the images in parallel; stop at the first failure
+            futures = [_OCR_POOL.submit(process_image_to_text, f) for f in image_files]
+            for next_done in asyncio.as_completed([asyncio.wrap_future(f) for f in futures]):
+                description = await next_done
+                if "error" in description.lower(): # Check if image processing failed
+                    for pending in futures:
+                        pending.cancel()
+                    logger.warning("[GenerateReportView] Image processing failed: %s", description)
+                    return Response({'error': f"Image processing failed: {description}"}, status=status.HTTP_400_BAD_REQUEST)
+            image_description = "\n".join(future.result() for future in futures)
 
         # ... (rest of the data collection and query construction) ...
         
-        # Construct a comprehensive query for the RAG pipeline
-        report_query_parts = []
-
-        if user_report_query:
-            report_query_parts.append(f"User's specific request: {user_report_query}")
-        else:
-            report_query_parts.append("Generate a detailed farming report and recommendations.")
-            
-        report_query_parts.append("Consider the following information (if provided):")
-
-        if soil_type:
-            report_query_parts.append(f"- Soil Type: {soil_type}")
-        if budget:
-            report_query_parts.append(f"- Budget: ${budget}")
-        if crop_preference:
-            report_query_parts.append(f"- Crop Preference: {crop_preference}")
-        if land_area:
-            report_query_parts.append(f"- Land Area: {land_area} acres")
-        if climate_zone:
-            report_query_parts.append(f"- Climate Zone: {climate_zone}")
-        if additional_notes:
-            report_query_parts.append(f"- Additional Notes: {additional_notes}")
-        if image_description:
-            report_query_parts.append(f"- Image Context: {image_description}")
-        
-        # ... (Tavily search logic is omitted for brevity but is still there) ...
-
-        # Add instructions for comprehensive report generation
-        report_query_parts.append(
-            "The report should cover the entire process from cultivation to harvesting, "
-            "including optimal crop selection, detailed cultivation practices, pest and disease management, "
-            "irrigation strategies, fertilization plans, estimated costs, expected yields, "
-            "and current market rates for the produce. Provide a comprehensive and actionable plan."
+        # Construct a comprehensive query for the RAG pipeline; empty fields are skipped
+        report_query = "\n".join(part for part in (
+            f"User's specific request: {user_report_query}" if user_report_query
+            else "Generate a detailed farming report and recommendations.",
+            "Consider the following information (if provided):",
+            soil_type and f"- Soil Type: {soil_type}",
+            budget and f"- Budget: ${budget}",
+            crop_preference and f"- Crop Preference: {crop_preference}",
+            land_area and f"- Land Area: {land_area} acres",
+            climate_zone and f"- Climate Zone: {climate_zone}",
+            additional_notes and f"- Additional Notes: {additional_notes}",
+            image_description and f"- Image Context: {image_description}",
+            # Add instructions for comprehensive report generation
+            REPORT_INSTRUCTIONS,
+        ) if part)
+        logger.debug("[GenerateReportView] Constructed report query (first 100 chars): %.100s", report_query)
+
+        # The pipeline runs on a Celery worker; the page polls ReportStatusView,
+        # which only answers the user who started the task
+        task_id = str(uuid.uuid4())
+        await cache.aset(_report_task_owner_key(task_id), request.user.id, settings.CELERY_RESULT_EXPIRES)
+        await sync_to_async(generate_report_task.apply_async)(
+            args=(request.user.id, user_report_query, report_query), task_id=task_id
         )
-        
-        report_query = "\n".join(report_query_parts)
-        print(f"[GenerateReportView] Constructed report query (first 100 chars): {report_query[:100]}")
-        
-        if not report_query.strip() or (len(report_query_parts) == 2 and "Generate a detailed farming report and recommendations." in report_query_parts[0] and "Consider the following information (if provided):" in report_query_parts[1]):
-             print("[GenerateReportView] No information provided to generate a report.")
-             return Response({'error': 'Please provide some information or a query to generate a report.'}, status=status.HTTP_400_BAD_REQUEST)
+        logger.debug("[GenerateReportView] Queued report generation task %s", task_id)
+        return Response({'task_id': task_id}, status=status.HTTP_202_ACCEPTED)
 
-        try:
-            print("[GenerateReportView] Getting RAG pipeline.")
-            rag_pipeline = get_rag_pipeline()
-            inputs = {"question": report_query}
-            
-            print("[GenerateReportView] Invoking RAG pipeline...")
-            final_state = rag_pipeline.invoke(inputs)
-            print("[GenerateReportView] RAG pipeline invocation finished.")
-            
-            if not final_state or "generation" not in final_state:
-                print("[GenerateReportView] Error: Pipeline finished but no 'generation' in final state.")
-                return Response({'error': 'Could not generate a detailed report.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            report_content = final_state["generation"]
-            print("[GenerateReportView] Successfully generated report content.")
-
-            # Generate a title for the report
-            title = user_report_query if user_report_query else "Farming Report"
-            title = (title[:197] + '...') if len(title) > 200 else title
-
-            print(f"[GenerateReportView] Saving report with title: {title}")
-            # Save the generated report to the database
-            new_report = Report.objects.create(
-                user=request.user,
-                title=title,
-                content=report_content
-            )
-            print("[GenerateReportView] Report saved to database successfully.")
-
-            # Prepare the new report data for the frontend
-            new_report_data = {
-                'id': new_report.id,
-                'title': new_report.title,
-                'content': new_report.content,
-                'created_at': new_report.created_at.strftime('%b %d, %Y, %I:%M %p')
-            }
 
-            return Response({
-                'report': report_content,
-                'new_report': new_report_data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            print(f"--- [GenerateReportView] UNEXPECTED ERROR ---")
-            print(f"Error in RAG pipeline for report generation: {e}")
-            import traceback
-            traceback.print_exc()
-            print("--- END OF TRACEBACK ---")
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+def _report_task_owner_key(task_id):
+    return f'reporttask:{task_id}'
+
+class ReportStatusView(APIView):
+    """
+    API View to poll a report generation task started by GenerateReportView.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, task_id):
+        if cache.get(_report_task_owner_key(task_id)) != request.user.id:
+            raise Http404
+        result = AsyncResult(task_id)
+        if result.successful():
+            report = get_object_or_404(Report.objects.only('id', 'title', 'content', 'created_at'), id=result.result, user=request.user)
+            return Response({'state': result.state, 'new_report': report_data(report)})
+        if result.failed():
+            # The exception text is for the logs, not the client
+            logger.error("[ReportStatusView] Report task %s failed: %s", task_id, result.result)
+            return Response({'state': result.state, 'error': 'Could not generate the report. Please try again.'})
+        return Response({'state': result.state})
 
 
 class ChatMessageSerializer(serializers.ModelSerializer):
@@ -263,12 +462,50 @@ class ChatHistoryView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    page_size = 50
+
     def get(self, request, session_id):
-        # Ensure the session exists and belongs to the current user
-        session = get_object_or_404(ChatSession, id=session_id, user=request.user)
-        messages = session.messages.all()
-        serializer = ChatMessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        # Keyset pagination from the newest message backwards: ?before_id=<id>
+        # returns the page preceding that message without an OFFSET scan
+        before_id = request.query_params.get('before_id')
+        if before_id:
+            try:
+                before_id = int(before_id)
+            except ValueError:
+                return Response({'error': 'before_id must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Ownership is checked in the same query that loads the messages
+        messages = ChatMessage.objects.filter(session_id=session_id, session__user=request.user)
+
+        # Messages never change once written, so a page before a given id is
+        # immutable; the newest page is versioned by the session's latest message
+        if before_id:
+            cache_key = f'chathistory:{request.user.id}:{session_id}:before:{before_id}'
+        else:
+            latest_id = messages.aggregate(latest=Max('id'))['latest']
+            cache_key = f'chathistory:{request.user.id}:{session_id}:latest:{latest_id}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = self._page(request, session_id, messages, before_id)
+            cache.set(cache_key, data, RESPONSE_CACHE_TIMEOUT)
+        return Response(data)
+
+    def _page(self, request, session_id, messages, before_id):
+        messages = messages.only('id', 'message', 'is_user_message', 'created_at').order_by('-id')
+        if before_id:
+            messages = messages.filter(id__lt=before_id)
+        page = list(messages[:self.page_size + 1])
+        # An empty page is either an empty session or one the user can't see
+        if not page and not ChatSession.objects.filter(id=session_id, user=request.user).exists():
+            raise Http404
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size][::-1] # Oldest first for display
+
+        serializer = ChatMessageSerializer(page, many=True)
+        return {
+            'results': serializer.data,
+            'next_before_id': page[0].id if has_more else None,
+        }
 
 class ReportSerializer(serializers.ModelSerializer):
     class Meta:
@@ -282,6 +519,45 @@ class ReportDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, report_id):
-        report = get_object_or_404(Report, id=report_id, user=request.user)
-        serializer = ReportSerializer(report)
-        return Response(serializer.data)
+        # Reports never change after generation; the user id in the key keeps
+        # one user's cached report from being served to another
+        data = cache.get_or_set(
+            f'report:{request.user.id}:{report_id}',
+            lambda: ReportSerializer(get_object_or_404(Report, id=report_id, user=request.user)).data,
+            RESPONSE_CACHE_TIMEOUT,
+        )
+        return Response(data)
+
+class HistoryListView(APIView):
+    """
+    Base view for the sidebar lists: one page of the user's items, newest
+    first, continued with ?before_id=<next_before_id>.
+    """
+    permission_classes = [IsAuthenticated]
+    model = None
+
+    def get(self, request):
+        before_id = request.query_params.get('before_id')
+        try:
+            before_id = int(before_id) if before_id else None
+        except ValueError:
+            return Response({'error': 'before_id must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        items, next_before_id = _newest_first_page(
+            self.model.objects.filter(user=request.user).only('id', 'title'), before_id
+        )
+        return Response({
+            'results': [{'id': item.id, 'title': item.title} for item in items],
+            'next_before_id': next_before_id,
+        })
+
+class ReportListView(HistoryListView):
+    """
+    API View to page through the user's reports.
+    """
+    model = Report
+
+class ChatSessionListView(HistoryListView):
+    """
+    API View to page through the user's chat sessions.
+    """
+    model = ChatSession
@@ -0,0 +1,13 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'smart_farming_recommender.settings')
+
+app = Celery('smart_farming_recommender')
+
+# Read CELERY_* settings from Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Discover tasks.py modules in installed apps
+app.autodiscover_tasks()
@@ -41,7 +41,9 @@ INSTALLED_APPS = [
     'accounts',
     'rest_framework',
     'rest_framework_simplejwt',
+    'adrf',
     'rag_core',
+    'djcelery_email',
 ]
 
 MIDDLEWARE = [
@@ -85,6 +87,27 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/1'),
+    }
+}
+
+# rag_core's semantic answer cache, shared by all web workers. Needs Redis
+# vector search (Redis 8+ or Redis Stack), which only indexes database 0; its
+# keys are namespaced under rag_core:semantic_cache:, but a dedicated Redis
+# keeps them apart from the Celery broker entirely
+SEMANTIC_CACHE_REDIS_URL = os.environ.get('SEMANTIC_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+# Keep sessions in Redis so login() doesn't write a row to the sessions table
+SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+SESSION_CACHE_ALIAS = 'default'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -104,6 +127,14 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Existing PBKDF2 hashes are upgraded to Argon2 on the user's next login
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -122,6 +153,10 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+# Uploaded files (chat images are stored under chat_uploads/)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -133,18 +168,73 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 # In your .env file, set the following:
 # EMAIL_HOST_USER=your-email@gmail.com
 # EMAIL_HOST_PASSWORD=your-email-password
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# send_mail only enqueues a Celery task; the worker delivers over SMTP.
+# See the Celery section below for the worker and beat commands.
+EMAIL_BACKEND = 'djcelery_email.backends.CeleryEmailBackend'
+CELERY_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+CELERY_EMAIL_TASK_CONFIG = {
+    'queue': 'email',
+    'rate_limit': '50/m',
+    'ignore_result': True,
+}
+CELERY_EMAIL_CHUNK_SIZE = 10
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 
+# Celery
+# Emails go to the "email" queue and rag_core tasks (chat persistence, reports,
+# upload purging) to the "rag" queue; both must be consumed. Run:
+#   celery -A smart_farming_recommender worker -Q email,rag -l info
+#   celery -A smart_farming_recommender beat -l info   # for CELERY_BEAT_SCHEDULE
+# (or separate workers per queue, e.g. to keep slow reports away from email).
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+# Needed for ReportStatusView to read report generation results
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+CELERY_RESULT_EXPIRES = 60 * 60
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_TASK_ROUTES = {
+    'rag_core.tasks.*': {'queue': 'rag'},
+}
+CELERY_BEAT_SCHEDULE = {
+    'purge-chat-uploads': {
+        'task': 'rag_core.tasks.purge_chat_uploads',
+        'schedule': 60 * 60,
+    },
+}
+# Chat images older than this are deleted by the purge-chat-uploads beat job
+CHAT_UPLOAD_MAX_AGE_HOURS = int(os.environ.get('CHAT_UPLOAD_MAX_AGE_HOURS', '24'))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # Reverse proxies in front of the app. Throttles key on REMOTE_ADDR when 0, and
+    # otherwise on the X-Forwarded-For entry that many hops back; leaving it unset
+    # would trust the raw, client-supplied X-Forwarded-For header
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '0')),
+    # Used by accounts.throttles on the endpoints that send OTP emails
+    'DEFAULT_THROTTLE_RATES': {
+        'otp_ip': '5/min',
+        'otp_email': '3/min',
+    },
 }
 
 LOGIN_URL = 'login_page'
+
+# Plant disease classifier weights used by rag_core.disease_predictor.
+# DISEASE_MODEL_ONNX_PATH (rag_core/export_onnx.py) runs inference on ONNX Runtime
+# and takes precedence over DISEASE_MODEL_INT8_PATH (rag_core/quantize_model.py),
+# which in turn takes precedence over the FP32 weights. Set DISEASE_MODEL_SHA256
+# to verify whichever file is loaded.
+DISEASE_MODEL_PATH = os.environ.get(
+    'DISEASE_MODEL_PATH', '/Users/ishantsingh/CPS_PROJECT/plant_disease_model_1_latest.pt'
+)
+DISEASE_MODEL_INT8_PATH = os.environ.get('DISEASE_MODEL_INT8_PATH')
+DISEASE_MODEL_ONNX_PATH = os.environ.get('DISEASE_MODEL_ONNX_PATH')
+DISEASE_MODEL_SHA256 = os.environ.get('DISEASE_MODEL_SHA256')